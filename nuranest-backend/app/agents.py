@@ -2,18 +2,23 @@ import os
 import logging
 import json
 from dotenv import load_dotenv
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.tools import tool
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from app.symptom_classifier import classify_symptom
-from app.timeline_parser import extract_week
-from app.timeline_checker import check_symptoms_by_week
+from app.faiss_index import IndexConfig, apply_search_params
+from app.vector_store import load_vectorstore
+from app.hybrid_search import HybridRetriever, SparseIndex
+from app.embedding_batcher import BatchingEmbeddings
+from app.embedding_backends import load_embeddings
+from app.query_analysis import QueryAnalysis, analyze_query, print_risk_summary
 from app.triage_engine import run_triage_questions
-from app.combo_checker import infer_symptom_combinations
+from app.chunk_display import chunk_snippet, source_filename
+from app.retrieval_context import RetrievalContext, current_retrieval_context
+from app.answer_cache import SemanticAnswerCache
+from app.topic_filter import OFF_TOPIC_RESPONSE, is_pregnancy_related
+from app.config import settings
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +30,31 @@ logger = logging.getLogger(__name__)
 # Global variable to hold the agent instance for tool access
 _agent_instance = None
 
+RAG_SYSTEM_PROMPT = """You are a specialized pregnancy health assistant. You ONLY answer questions related to pregnancy, maternal health, and prenatal care.
+
+IMPORTANT RULES:
+1. ONLY answer pregnancy-related questions (prenatal care, nutrition, complications, exercise, etc.)
+2. If asked about non-pregnancy topics, politely redirect to pregnancy health
+3. Base your answer on the medical information provided with the question
+4. Provide clear, direct answers based on medical information
+5. Always include a medical disclaimer for pregnancy health advice
+6. Write in a natural, conversational tone - never mention "context", "sources provided" or "search results"
+
+Focus on being a helpful pregnancy health expert."""
+
+
+def format_search_results(docs: list) -> str:
+    """Format retrieved documents as numbered source excerpts"""
+    results = []
+    for i, doc in enumerate(docs[:3], 1):
+        # Filename and snippet are precomputed at ingestion
+        filename = source_filename(doc)
+        print(f"📄 Found in: {filename}")
+        results.append(f"**Source {i}** ({filename}):\n{chunk_snippet(doc)}")
+
+    return "\n\n---\n\n".join(results) if results else "No relevant information found."
+
+
 @tool
 def pregnancy_search_tool(query: str) -> str:
     """Search for pregnancy health information from medical sources. Input should be a clear question about pregnancy health, nutrition, or care."""
@@ -34,62 +64,101 @@ def pregnancy_search_tool(query: str) -> str:
         if _agent_instance is None or _agent_instance.retriever is None:
             return "Sorry, the search system is not properly initialized."
         
-        docs = _agent_instance.retriever.invoke(query)
-
-        results = []
-        for i, doc in enumerate(docs[:3], 1):
-            source = doc.metadata.get('source', None)
-            filename = (
-                source.split('/')[-1] if source and '/' in source else source
-            )
-            filename = (
-                filename.split('\\')[-1] if filename and '\\' in filename else filename or "Unknown source"
-            )
-            print(f"📄 Found in: {filename}")
-            
-            content = doc.page_content.strip().replace("\n", " ")
-            if len(content) > 300:
-                content = content[:300] + "..."
-            
-            results.append(f"**Source {i}** ({filename}):\n{content}")
-
-        return "\n\n---\n\n".join(results) if results else "No relevant information found."
+        # Reuse the documents already retrieved for the current question
+        retrieval = current_retrieval_context()
+        if retrieval is not None:
+            docs = retrieval.documents()
+        else:
+            docs = _agent_instance.retrieve(query, lambda: _agent_instance.embeddings.embed_query(query))
+
+        return format_search_results(docs)
     except Exception as e:
         logger.error(f"❌ Error during document search: {e}")
         return "Sorry, I couldn't search the pregnancy database right now."
 
+PIPELINE_MODES = ("agent", "direct")
+RETRIEVAL_MODES = ("dense", "hybrid")
+
 class PregnancyHealthAgent:
-    def __init__(self):
+    """
+    Retrieval-augmented pregnancy health assistant.
+
+    Pipeline modes:
+    - "agent": tool-calling AgentExecutor; the LLM decides when to search
+      (usually two LLM calls per question)
+    - "direct": retrieve once and answer with a single LLM call; clearly
+      off-topic questions are refused by a keyword pre-check without calling
+      the LLM
+    """
+
+    def __init__(self, pipeline_mode: str = None):
+        self.pipeline_mode = (pipeline_mode or settings.pipeline_mode).lower()
+        if self.pipeline_mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{self.pipeline_mode}', expected one of {PIPELINE_MODES}")
         self.embeddings = None
         self.vectorstore = None
         self.retriever = None
+        self.hybrid = None
         self.llm = None
         self.agent_executor = None
+        self.search_k = 3
+        self.answer_cache = SemanticAnswerCache(
+            threshold=settings.answer_cache_threshold,
+            max_entries=settings.answer_cache_max_entries,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+            max_bytes=settings.answer_cache_max_mb * 1024 * 1024,
+        ) if settings.answer_cache_enabled else None
 
     def _initialize_retriever(self):
         try:
             print("🔍 Loading vectorstore and embeddings...")
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"},
-                encode_kwargs={"normalize_embeddings": True},
-            )
+            # torch, ONNX or int8 ONNX (EMBEDDING_BACKEND), checked against torch before use
+            self.embeddings = load_embeddings()
+            if settings.embedding_batch_window_ms > 0:
+                # Concurrent questions share one forward pass instead of encoding one at a time
+                self.embeddings = BatchingEmbeddings(
+                    self.embeddings,
+                    window_ms=settings.embedding_batch_window_ms,
+                    max_batch=settings.embedding_batch_max,
+                )
             # Use the existing vectorstore path
-            db_path = "vectorstore_local"
+            db_path = settings.vectorstore_path
             if not os.path.exists(db_path):
                 raise FileNotFoundError(f"FAISS DB not found at {db_path}")
-            self.vectorstore = FAISS.load_local(db_path, self.embeddings, allow_dangerous_deserialization=True)
-            self.retriever = self.vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": 3})
+            # Vectors are memory-mapped and chunk text is read from SQLite only for the hits
+            self.vectorstore = load_vectorstore(db_path, self.embeddings, mmap=settings.vectorstore_mmap)
+            # IVF / HNSW indexes take their query-time nprobe / efSearch (and compressed ones their re-scoring depth) from settings
+            apply_search_params(self.vectorstore.index, IndexConfig.from_settings(settings))
+            self.retriever = self.vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": self.search_k})
+            self._initialize_hybrid(db_path)
             print("✅ Vectorstore loaded successfully.")
         except Exception as e:
             logger.error(f"❌ Failed to load vectorstore: {e}")
             raise
 
+    def _initialize_hybrid(self, db_path: str):
+        """Add BM25 keyword search when hybrid retrieval is enabled and the index has a sparse table"""
+        mode = settings.retrieval_mode.lower()
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}', expected one of {RETRIEVAL_MODES}")
+        if mode != "hybrid":
+            return
+        sparse = SparseIndex.open(db_path)
+        if sparse is None:
+            logger.warning(f"⚠️ {db_path} has no sparse index - re-run ingest_local.py --rebuild for hybrid retrieval")
+            return
+        self.hybrid = HybridRetriever(
+            self.vectorstore,
+            sparse,
+            fetch_k=settings.hybrid_fetch_k,
+            rrf_k=settings.hybrid_rrf_k,
+            max_workers=settings.max_inflight_requests,
+        )
+        print("🔀 Hybrid retrieval enabled (dense + BM25).")
+
     def initialize_system(self):
         try:
             print("🚀 Initializing Pregnancy Health AI System...")
-            global _agent_instance
-            _agent_instance = self
             self._initialize_retriever()
 
             groq_api_key = os.getenv("GROQ_API_KEY")
@@ -103,9 +172,25 @@ class PregnancyHealthAgent:
                 max_tokens=2000,
             )
 
-            # Create the agent
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are a specialized pregnancy health assistant. You ONLY answer questions related to pregnancy, maternal health, and prenatal care.
+            self._build_pipeline()
+            
+            print("✅ Pregnancy AI system is ready!")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Initialization failed: {e}")
+            return False
+
+    def _build_pipeline(self):
+        """Wire the LLM and retriever into the configured pipeline"""
+        global _agent_instance
+        _agent_instance = self
+        print(f"🧭 Pipeline mode: {self.pipeline_mode}")
+        if self.pipeline_mode != "agent":
+            return
+
+        # Create the agent
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a specialized pregnancy health assistant. You ONLY answer questions related to pregnancy, maternal health, and prenatal care.
 
 IMPORTANT RULES:
 1. ONLY answer pregnancy-related questions (prenatal care, nutrition, complications, exercise, etc.)
@@ -120,58 +205,93 @@ Example responses:
 - Non-pregnancy question: "I'm a pregnancy health assistant. I can help you with questions about pregnancy, prenatal care, maternal health, and related topics. What would you like to know about pregnancy health?"
 
 Focus on being a helpful pregnancy health expert."""),
-                ("human", "{input}"),
-                MessagesPlaceholder(variable_name="agent_scratchpad"),
-            ])
+            ("human", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ])
 
-            agent = create_openai_tools_agent(self.llm, [pregnancy_search_tool], prompt)
-            self.agent_executor = AgentExecutor(agent=agent, tools=[pregnancy_search_tool], verbose=False, max_iterations=3)
-            
-            print("✅ Pregnancy AI system is ready!")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Initialization failed: {e}")
-            return False
+        agent = create_openai_tools_agent(self.llm, [pregnancy_search_tool], prompt)
+        self.agent_executor = AgentExecutor(agent=agent, tools=[pregnancy_search_tool], verbose=False, max_iterations=3)
 
-    def process_question(self, query: str) -> dict:
+    def search_by_vector(self, embedding: list) -> list:
+        """Search the vectorstore with an already computed query embedding"""
+        return self.vectorstore.similarity_search_by_vector(embedding, k=self.search_k)
+
+    def retrieve(self, query: str, embed) -> list:
+        """Top documents for a question; ``embed`` computes its embedding (called once)"""
+        if self.hybrid is None:
+            return self.search_by_vector(embed())
+        return self.hybrid.search(query, embed, k=self.search_k)
+
+    def process_question(self, query: str, analysis: QueryAnalysis = None) -> dict:
         try:
             print("🤔 Processing your question...")
                 
-            # 1. Step: LLM-generated final answer (chat-style)
-            result = self.agent_executor.invoke({"input": query})
-            final_response = result.get("output", "").strip()
-
-            if not final_response:
-                return {
-                    "message": "I couldn't find a specific answer to your question.",
-                    "risk_table": [],
-                    "raw_response": ""
-                }
-        
-            # 2. Step: Symptom parsing (example using regex or rule-based)
-            symptoms = classify_symptom(query)
-            symptom_combinations = infer_symptom_combinations(query)  # Like "headache + swelling" → preeclampsia
-            week = extract_week(query)
-            timeline_results = check_symptoms_by_week(week, query) if week else [] # e.g., "6 weeks" → ectopic risk
+            # 1. Step: Symptom parsing (rule-based, always fresh - never cached)
+            if analysis is None:
+                analysis = analyze_query(query)
+            symptoms = list(analysis.classifications)
+            symptom_combinations = list(analysis.combinations)  # Like "headache + swelling" → preeclampsia
+            timeline_results = list(analysis.timeline_results)  # e.g., "6 weeks" → ectopic risk
 
             print("detected symptoms:", symptoms)
             print("detected combinations:", symptom_combinations)
             print("timeline results:", timeline_results)
 
-            # 4. Step: Risk Table (structured response)
-            risk_table = []
-            if symptom_combinations:
-                for combo, risk in symptom_combinations:
-                    risk_table.append({
-                        "Symptoms": combo,
-                        "Risk Condition": risk,
-                        "Recommended Action": "Seek immediate medical attention" if risk.lower() in ["preeclampsia", "ectopic pregnancy"] else "Monitor and consult OB-GYN"
-                    })
-
-            # # Format the response professionally
-            formatted_response = self._format_response(final_response)
-
-            # 5. Step: Construct structured response
+            # 2. Step: Risk Table (structured response)
+            risk_table = list(analysis.risk_table)
+
+            # 3. Step: LLM-generated final answer (chat-style), or a cached answer to a similar question
+            # The retrieval context makes the cache, the tool and the source list share one embedding and search
+            cache_guard = analysis.cache_guard()
+            cache_hit = False
+            with RetrievalContext(query, self) as retrieval:
+                if self.pipeline_mode == "direct" and not is_pregnancy_related(query, analysis):
+                    print("🚫 Off-topic question - answered without retrieval or LLM call")
+                    return {
+                        "message": OFF_TOPIC_RESPONSE,
+                        "risk_table": [],
+                        "raw_response": "",
+                        "timeline_results": [],
+                        "symptom_combinations": [],
+                        "symptoms": [],
+                        "sources": [],
+                        "retrieval_stats": retrieval.stats(),
+                        "cache_hit": False,
+                    }
+
+                cached = self.answer_cache.lookup(retrieval.embedding(), cache_guard) if self.answer_cache else None
+                if cached is not None:
+                    print("🎯 Reusing cached answer for a similar question")
+                    cache_hit = True
+                    result = ""
+                    formatted_response = cached.message
+                    sources = list(cached.sources)
+                else:
+                    if self.pipeline_mode == "direct":
+                        result = self._answer_direct(query, retrieval)
+                    else:
+                        result = self.agent_executor.invoke({"input": query})
+                    final_response = result.get("output", "").strip()
+                    sources = retrieval.sources()
+
+                    if not final_response:
+                        return {
+                            "message": "I couldn't find a specific answer to your question.",
+                            "risk_table": risk_table,
+                            "raw_response": "",
+                            "timeline_results": timeline_results,
+                            "symptom_combinations": symptom_combinations,
+                            "symptoms": symptoms,
+                            "sources": sources,
+                            "retrieval_stats": retrieval.stats(),
+                        }
+
+                    # Format the response professionally
+                    formatted_response = self.format_response(final_response)
+                    if self.answer_cache:
+                        self.answer_cache.store(query, retrieval.embedding(), formatted_response, sources, cache_guard)
+
+            # 4. Step: Construct structured response
             response_payload = {
                 "message": formatted_response,
                 "risk_table": risk_table,
@@ -179,6 +299,9 @@ Focus on being a helpful pregnancy health expert."""),
                 "symptom_combinations": symptom_combinations,
                 "timeline_results": timeline_results,
                 "raw_response": result,
+                "sources": sources,
+                "retrieval_stats": retrieval.stats(),
+                "cache_hit": cache_hit,
             }
 
             
@@ -193,28 +316,54 @@ Focus on being a helpful pregnancy health expert."""),
                 "timeline_results": [],
                 "symptom_combinations": [],
                 "symptoms": [],
+                "sources": [],
             }    
+    def _answer_direct(self, query: str, retrieval: RetrievalContext) -> dict:
+        """Answer with exactly one LLM call, packing the retrieved context into the prompt"""
+        messages = self._build_rag_messages(query, retrieval.documents())
+        message = self.llm.invoke(messages)
+        return {"input": query, "output": message.content}
+
+    def prepare_streaming_answer(self, query: str, analysis: QueryAnalysis = None) -> tuple:
+        """Retrieve context for a question and build the prompt for a streamed answer.
+
+        Returns ``(None, [])`` for off-topic questions, which are answered without the LLM.
+        """
+        if not is_pregnancy_related(query, analysis):
+            return None, []
+        with RetrievalContext(query, self) as retrieval:
+            docs = retrieval.documents()
+            sources = retrieval.sources()
+        return self._build_rag_messages(query, docs), sources
+
+    async def astream_answer(self, messages: list):
+        """Yield answer tokens from the LLM as they arrive"""
+        if messages is None:
+            yield OFF_TOPIC_RESPONSE
+            return
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                yield chunk.content
+
+    def _build_rag_messages(self, query: str, docs: list) -> list:
+        """Pack the retrieved documents and the question into a single prompt"""
+        context = format_search_results(docs)
+        return [
+            SystemMessage(content=RAG_SYSTEM_PROMPT),
+            HumanMessage(content=f"Medical information:\n{context}\n\nQuestion: {query}"),
+        ]
+
     def get_sources_for_question(self, query: str) -> list:
         """Get sources used for a question (for terminal display)"""
-        try:
-            if not self.retriever:
-                return []
-            
-            docs = self.retriever.invoke(query)
-            sources = []
-            
-            for i, doc in enumerate(docs[:3], 1):
-                source = doc.metadata.get('source', 'Unknown source')
-                filename = source.split('/')[-1] if '/' in source else source
-                filename = filename.split('\\')[-1] if '\\' in filename else filename
-                sources.append(filename)
-            
-            return sources
-        except Exception as e:
-            logger.error(f"Error getting sources: {e}")
+        if not self.retriever:
             return []
+        # Prefer the documents already retrieved for the question being processed
+        retrieval = current_retrieval_context()
+        if retrieval is not None and retrieval.question == query:
+            return retrieval.sources()
+        return RetrievalContext(query, self).sources()
 
-    def _format_response(self, response: str) -> str:
+    def format_response(self, response: str) -> str:
         """Format the response in a professional manner"""
         # Remove any "tool results" language
         response = response.replace("Based on the results from the tool", "")
@@ -288,43 +437,20 @@ if __name__ == "__main__":
 
                 full_context = ""
 
-                # extract week if applicable
-                week = extract_week(question)
-                timeline_results = check_symptoms_by_week(week, question) if week else []
-
-                # symptom classification
-                classifications = classify_symptom(question)
-                combination_results = infer_symptom_combinations(question)
-
-                if timeline_results.__contains__(question) or combination_results.__contains__(question) or classifications.__contains__(question):
-                    print("⚠️ High-risk symptoms detected! Immediate medical attention is recommended.")
-                    # Process the question with the agent
-                    response = agent.process_question(question)
-                else:
-                    # Ask more questions proactively from the user
-                    user_data = run_triage_questions(question)
-                    # 🧠 Merge responses
-                    full_context = " ".join(user_data.values()).lower()
-
-                    # extract week if applicable
-                    week = extract_week(full_context)
-                    timeline_results = check_symptoms_by_week(week, full_context) if week else []
-
-                    # symptom classification
-                    classifications = classify_symptom(full_context)
-                    combination_results = infer_symptom_combinations(full_context)
-
-                    response = agent.process_question(full_context)
-                
-                
+                # Ask more questions proactively from the user
+                user_data = run_triage_questions(question)
+                # 🧠 Merge responses; the rule-engine analysis runs once, on the merged answers
+                full_context = " ".join(user_data.values()).lower()
+                analysis = analyze_query(full_context)
+                response = agent.process_question(full_context, analysis)
 
                 response_json = {
                     "status": "success",
                     "response": {
                         "chatbot_answer": response,
-                        "symptom_combinations": combination_results,
-                        "timeline_conditions": timeline_results,
-                        "combination_inferences": combination_results, 
+                        "symptom_combinations": list(analysis.combinations),
+                        "timeline_conditions": list(analysis.timeline_results),
+                        "combination_inferences": list(analysis.combinations),
                         },
                 "confidence_score": response.get("confidence_score", None),
                 # "timestamp": datetime.now().isoformat(),
@@ -333,45 +459,18 @@ if __name__ == "__main__":
                 }
                 print(json.dumps(response_json, indent=2))
 
-                # Show classification results
-                if classifications:
-                    print("\n⚠️ Symptom Risk Summary:")
-                    for c in classifications:
-                        print(f"- '{c['matched_phrase']}' → Risk: {c['risk']}, Condition: {c['condition']}")
-                        print(f"  Suggested Action: {c['action']}")
-
-                if week and timeline_results:
-                    print("\n📅 Timeline-Aware Risk(s):")
-                    for res in timeline_results:
-                        print(f"- Week {week}: '{res['symptom']}' → {res['condition']} ({res['risk']})")
-                        print(f"  Action: {res['action']}")
-
-                if combination_results:
-                    print("\n🧩 Inferred Risk Combination(s):")
-                    for res in combination_results:
-                        print(f"- Symptoms: {', '.join(res['matched_symptoms'])} → {res['condition']} ({res['risk']})")
-                        print(f"  Urgent Action: {res['action']}")
-                else:
-                    print("\n✅ No high-risk symptom combinations detected.")
+                print_risk_summary(analysis)
 
-                # Show sources used
+                # Show sources used (retrieved once while answering)
                 if full_context == "":
                     print("\n🔍 No sources used for this question.")
-                    sources = agent.get_sources_for_question(question)
-                    if sources:
-                        print(f"\n📚 Sources used:")
-                        for i, source in enumerate(sources, 1):
-                            print(f"  {i}. {source}")
-                
-                    print("\n" + "-" * 60)
-                else:
-                    sources = agent.get_sources_for_question(full_context)
-                    if sources:
-                        print(f"\n📚 Sources used:")
-                        for i, source in enumerate(sources, 1):
-                            print(f"  {i}. {source}")
-                
-                    print("\n" + "-" * 60)
+                sources = response.get("sources", [])
+                if sources:
+                    print(f"\n📚 Sources used:")
+                    for i, source in enumerate(sources, 1):
+                        print(f"  {i}. {source}")
+            
+                print("\n" + "-" * 60)
                 
                 
             except KeyboardInterrupt:
@@ -0,0 +1,145 @@
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    embedding: np.ndarray
+    message: str
+    sources: List[str]
+    guard: Hashable
+    created_at: float = field(default_factory=time.monotonic)
+    size_bytes: int = 0
+
+
+class SemanticAnswerCache:
+    """
+    Answer cache keyed on query embeddings.
+
+    A lookup hits when a previously answered question has cosine similarity
+    of at least ``threshold`` with the new one and the same ``guard`` (e.g. the
+    gestational week and detected symptoms), so rephrasings share an answer but
+    clinically different questions never do. Entries are evicted least recently
+    used first, expire after ``ttl_seconds`` and are bounded by both
+    ``max_entries`` and ``max_bytes``.
+
+    Only the LLM answer and its sources are cached; callers recompute rule-engine
+    output for every request.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 512,
+                 ttl_seconds: float = 3600, max_bytes: int = 16 * 1024 * 1024):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_ids: List[int] = []
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding, guard: Hashable = None) -> Optional[CachedAnswer]:
+        """Return the closest cached answer above the similarity threshold, if any"""
+        query = self._normalize(embedding)
+        with self._lock:
+            self._expire()
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            if self._matrix is None:
+                self._matrix_ids = list(self._entries.keys())
+                self._matrix = np.stack([self._entries[i].embedding for i in self._matrix_ids])
+
+            scores = self._matrix @ query
+            for index in np.argsort(-scores):
+                if scores[index] < self.threshold:
+                    break
+                entry_id = self._matrix_ids[index]
+                entry = self._entries[entry_id]
+                if entry.guard == guard:
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    logger.info(f"🎯 Answer cache hit ({scores[index]:.3f}) for: {entry.question}")
+                    return entry
+
+            self.misses += 1
+            return None
+
+    def store(self, question: str, embedding, message: str, sources: List[str], guard: Hashable = None):
+        """Cache an answer, evicting old entries to stay within the limits"""
+        vector = self._normalize(embedding)
+        entry = CachedAnswer(
+            question=question,
+            embedding=vector,
+            message=message,
+            sources=list(sources),
+            guard=guard,
+        )
+        entry.size_bytes = (
+            vector.nbytes
+            + sys.getsizeof(question)
+            + sys.getsizeof(message)
+            + sum(sys.getsizeof(s) for s in entry.sources)
+        )
+        if entry.size_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            self.size_bytes += entry.size_bytes
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                self._evict_oldest()
+            self._matrix = None
+
+    def _expire(self):
+        if not self.ttl_seconds:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [entry_id for entry_id, entry in self._entries.items() if entry.created_at < cutoff]
+        for entry_id in expired:
+            self.size_bytes -= self._entries.pop(entry_id).size_bytes
+        if expired:
+            self._matrix = None
+
+    def _evict_oldest(self):
+        _, entry = self._entries.popitem(last=False)
+        self.size_bytes -= entry.size_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self.size_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,42 @@
+from typing import Optional
+
+SNIPPET_CHARS = 300
+UNKNOWN_SOURCE = "Unknown source"
+
+
+def display_filename(source: Optional[str]) -> str:
+    """Bare filename of a source path (POSIX or Windows separators)"""
+    source = source or UNKNOWN_SOURCE
+    return source.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+def clean_snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    """Chunk text on one line, truncated to ``limit`` characters"""
+    snippet = text.strip().replace("\n", " ")
+    return snippet[:limit] + "..." if len(snippet) > limit else snippet
+
+
+def annotate_chunk(doc):
+    """
+    Store the display filename, snippet and page number in a chunk's metadata.
+
+    Done once at ingestion so formatting a search hit does no string work;
+    the readers below derive the fields for chunks of older indexes.
+    """
+    metadata = doc.metadata
+    metadata["filename"] = display_filename(metadata.get("source"))
+    metadata["snippet"] = clean_snippet(doc.page_content)
+    if isinstance(metadata.get("page"), int):
+        metadata["page_number"] = metadata["page"] + 1  # PyPDFLoader pages are 0-based
+    return doc
+
+
+def source_filename(doc) -> str:
+    """Display filename of a chunk's source"""
+    return doc.metadata.get("filename") or display_filename(doc.metadata.get("source"))
+
+
+def chunk_snippet(doc) -> str:
+    """Cleaned, truncated text of a chunk"""
+    snippet = doc.metadata.get("snippet")
+    return snippet if snippet is not None else clean_snippet(doc.page_content)
@@ -1,17 +1,49 @@
-from app.symptom_combinations import SYMPTOM_COMBINATIONS
+from typing import Optional
 
-def infer_symptom_combinations(user_input: str) -> list:
-    user_input = user_input.lower()
+from app.rule_store import CompiledRules, rule_store
+from app.symptom_matcher import SymptomMatches, match_symptoms
+
+def infer_symptom_combinations(user_input: str, matches: Optional[SymptomMatches] = None,
+                               rules: Optional[CompiledRules] = None) -> list:
+    rules = rules or rule_store.current()
+    if matches is None:
+        matches = match_symptoms(user_input, rules)
     matched_conditions = []
 
-    for rule in SYMPTOM_COMBINATIONS:
-        match_count = sum(1 for s in rule["symptoms"] if s in user_input)
-        if match_count >= len(rule["symptoms"]):  # all symptoms present
-            matched_conditions.append({
-                "condition": rule["condition"],
-                "risk": rule["risk"],
-                "action": rule["action"],
-                "matched_symptoms": rule["symptoms"]
-            })
+    combination_index = rules.combination_index
+    detected = combination_index.detected_mask(matches)
+    for index in combination_index.full_matches(detected):  # all symptoms present
+        rule = combination_index.rules[index]
+        matched_conditions.append({
+            "condition": rule["condition"],
+            "risk": rule["risk"],
+            "action": rule["action"],
+            "matched_symptoms": rule["symptoms"]
+        })
 
     return matched_conditions
+
+def rank_partial_combinations(user_input: str, matches: Optional[SymptomMatches] = None,
+                              min_overlap: int = 1, limit: Optional[int] = 5,
+                              rules: Optional[CompiledRules] = None) -> list:
+    """Combination rules that are only partly present, ranked by how many symptoms overlap"""
+    rules = rules or rule_store.current()
+    if matches is None:
+        matches = match_symptoms(user_input, rules)
+    partial_conditions = []
+
+    combination_index = rules.combination_index
+    detected = combination_index.detected_mask(matches)
+    ranked = combination_index.partial_matches(detected, min_overlap)
+    for index, overlap in ranked[:limit] if limit else ranked:
+        rule = combination_index.rules[index]
+        partial_conditions.append({
+            "condition": rule["condition"],
+            "risk": rule["risk"],
+            "action": rule["action"],
+            "matched_symptoms": [s for s in rule["symptoms"] if s in matches],
+            "missing_symptoms": [s for s in rule["symptoms"] if s not in matches],
+            "overlap": overlap,
+        })
+
+    return partial_conditions
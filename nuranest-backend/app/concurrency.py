@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceOverloadedError(Exception):
+    """Raised when the request queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many questions are being processed. Please retry shortly.")
+        self.retry_after = retry_after
+
+
+class InflightLimiter:
+    """
+    Bounds how many questions run at once and how many may wait for a slot.
+
+    Requests beyond ``max_inflight`` queue up to ``max_queued``; anything past
+    that is rejected immediately with ServiceOverloadedError.
+    """
+
+    def __init__(self, max_inflight: int, max_queued: int, retry_after: int):
+        self.max_inflight = max(1, max_inflight)
+        self.max_queued = max(0, max_queued)
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(self.max_inflight)
+        self.inflight = 0
+        self.queued = 0
+
+    def is_full(self) -> bool:
+        """True when a new request would be rejected"""
+        return self._semaphore.locked() and self.queued >= self.max_queued
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.is_full():
+            logger.warning(f"⚠️ Queue full ({self.inflight} in flight, {self.queued} queued) - rejecting request")
+            raise ServiceOverloadedError(self.retry_after)
+
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "max_inflight": self.max_inflight,
+            "max_queued": self.max_queued,
+        }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as its own task; callers that
+    arrive while it is running await the same task and get the same result
+    (or exception). A caller that disconnects doesn't cancel the work for the
+    others. Keys are forgotten as soon as the work finishes, so this only
+    merges requests that overlap in time - it is not a cache.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Result of ``work()`` for ``key``, and whether it was shared with an earlier caller"""
+        task = self._inflight.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {"inflight_keys": len(self._inflight), "executions": self.executions, "coalesced": self.coalesced}
@@ -28,13 +28,64 @@ class Settings(BaseSettings):
     groq_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None  # Allow this field
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # "torch", "onnx" or "onnx-int8" (dynamically quantized ONNX)
+    embedding_quantization: str = "avx2"  # int8 kernel target: "avx2", "avx512", "avx512_vnni" or "arm64"
+    embedding_agreement_threshold: float = 0.98  # Minimum cosine vs torch for an ONNX backend to be used
+    embedding_export_dir: str = ".embedding_models"  # Exported ONNX models and agreement checks
+    embedding_batch_window_ms: float = 2.0  # Collect concurrent query embeddings this long into one batch (0 disables)
+    embedding_batch_max: int = 16  # Queries per batched forward pass
     llm_model: str = "llama3-8b-8192"
     llm_temperature: float = 0.1
     llm_max_tokens: int = 2000
+    pipeline_mode: str = "agent"  # "agent" (tool-calling AgentExecutor) or "direct" (single LLM call)
     
     # Vectorstore settings
     vectorstore_path: str = "vectorstore_local"
+    vectorstore_mmap: bool = True  # Memory-map the index so worker processes share one copy
     search_k: int = 3
+    retrieval_mode: str = "hybrid"  # "dense" (FAISS only) or "hybrid" (FAISS + BM25, rank-fused)
+    hybrid_fetch_k: int = 20  # Candidates taken from each search before fusion
+    hybrid_rrf_k: int = 60  # Reciprocal rank fusion constant (higher = flatter rank weighting)
+    
+    # FAISS index (built by ingest_local.py; nprobe / ef_search also apply when loading)
+    faiss_index_type: str = "flat"  # "flat", "ivf_flat", "hnsw" or "ivf_pq"
+    faiss_nlist: int = 0  # IVF lists (0 = about 4 * sqrt(vectors))
+    faiss_nprobe: int = 8  # IVF lists scanned per query
+    faiss_hnsw_m: int = 32  # HNSW neighbours per node
+    faiss_ef_construction: int = 80  # HNSW build-time candidate list size
+    faiss_ef_search: int = 64  # HNSW query-time candidate list size
+    faiss_pq_m: int = 48  # IVF-PQ sub-quantizers (must divide the embedding dimension)
+    faiss_pq_nbits: int = 8  # IVF-PQ bits per sub-quantizer code
+    faiss_vector_storage: str = "float32"  # "float32", "float16" or "int8" (scalar-quantized) vectors
+    faiss_rescore_factor: int = 4  # float16/int8: candidates per result re-scored from vectors.npy (0 = write none)
+    
+    # Ingestion (ingest_local.py)
+    ingest_workers: int = 0  # Processes that load and split PDFs (0 = one per CPU)
+    ingest_batch_size: int = 256  # Chunks embedded and added to the index per batch
+    ingest_max_pending_files: int = 0  # Loaded PDFs buffered ahead of embedding (0 = two per worker)
+    dedup_threshold: float = 0.85  # MinHash similarity above which chunks are collapsed (0 disables)
+    embedding_cache_enabled: bool = True  # Reuse chunk embeddings across ingestion runs
+    embedding_cache_dir: str = ".embedding_cache"
+    
+    # Semantic answer cache (risk tables are never cached)
+    answer_cache_enabled: bool = True
+    answer_cache_threshold: float = 0.92  # Minimum cosine similarity for a hit
+    answer_cache_max_entries: int = 512
+    answer_cache_ttl_seconds: int = 3600
+    answer_cache_max_mb: int = 16
+    
+    # Clinical rules (symptoms, combinations, timeline, triage questions)
+    rules_path: Optional[str] = None  # Defaults to app/rules/clinical_rules.json
+    rules_check_interval: float = 5.0  # Seconds between rule file change checks (0 disables)
+    admin_token: Optional[str] = None  # Enables the admin endpoints when set
+    
+    # Startup
+    background_warmup: bool = True  # Load the model and index after the server starts accepting connections
+    
+    # Concurrency settings
+    max_inflight_requests: int = 4  # Agent runs executing at once (worker threads)
+    max_queued_requests: int = 32  # Requests allowed to wait for a free slot
+    overload_retry_after: int = 5  # Retry-After seconds sent with 503 when the queue is full
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,155 @@
+import os
+import re
+import json
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# torch: PyTorch (reference); onnx: exported ONNX graph on onnxruntime;
+# onnx-int8: the same graph with dynamically quantized int8 weights
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+AGREEMENT_FILENAME = "agreement.json"
+QUANTIZED_SUFFIX = "qint8"
+
+# Sentences embedded by both backends to check they agree
+AGREEMENT_PROBES = [
+    "What foods should I avoid during pregnancy?",
+    "I am 22 weeks pregnant and have a severe headache and swelling in my hands.",
+    "Take 400 micrograms of folic acid daily before conception and in early pregnancy.",
+    "Regular contractions, pelvic pressure and watery discharge may signal preterm labor.",
+    "Gestational diabetes is usually screened for between 24 and 28 weeks.",
+    "Moderate exercise such as walking and swimming is safe for most pregnancies.",
+    "Bleeding in the first trimester",
+    "Is it normal to feel dizzy when standing up quickly?",
+]
+
+
+class EmbeddingAgreementError(Exception):
+    """Raised when an accelerated backend's embeddings drift too far from the torch backend"""
+
+
+def _model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name)
+
+
+def backend_dir(model_name: str, backend: str) -> str:
+    """Where an exported model and its agreement check are kept"""
+    return os.path.join(settings.embedding_export_dir, _model_slug(model_name), backend)
+
+
+def _huggingface(model_name: str, **model_kwargs):
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": "cpu", **model_kwargs},
+        encode_kwargs={"normalize_embeddings": True},
+    )
+
+
+def _export_quantized(model_name: str, export_dir: str):
+    """Save the ONNX model locally and add a dynamically quantized int8 copy of its graph"""
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    logger.info(f"📦 Exporting int8 ONNX model for {model_name} (one-time)...")
+    model = SentenceTransformer(model_name, backend="onnx", device="cpu")
+    model.save(export_dir)
+    export_dynamic_quantized_onnx_model(
+        model, settings.embedding_quantization, export_dir, file_suffix=QUANTIZED_SUFFIX
+    )
+
+
+def load_backend(model_name: str, backend: str):
+    """Load ``model_name`` on one backend, without the agreement check or fallback"""
+    if backend == "torch":
+        return _huggingface(model_name)
+    if backend == "onnx":
+        # sentence-transformers uses the repo's ONNX graph, exporting one if the repo has none
+        return _huggingface(model_name, backend="onnx")
+
+    export_dir = backend_dir(model_name, backend)
+    quantized = os.path.join("onnx", f"model_{QUANTIZED_SUFFIX}.onnx")
+    if not os.path.exists(os.path.join(export_dir, quantized)):
+        _export_quantized(model_name, export_dir)
+    return _huggingface(export_dir, backend="onnx", model_kwargs={"file_name": quantized})
+
+
+def backend_of(embeddings) -> str:
+    """Backend an embedding model was loaded with (anything not on ONNX counts as torch)"""
+    model_kwargs = getattr(embeddings, "model_kwargs", None) or {}
+    if model_kwargs.get("backend") != "onnx":
+        return "torch"
+    return "onnx-int8" if (model_kwargs.get("model_kwargs") or {}).get("file_name") else "onnx"
+
+
+def cosine_agreement(candidate, reference, texts: List[str] = AGREEMENT_PROBES) -> dict:
+    """Per-text cosine similarity between two embedding models' vectors"""
+    a = np.asarray(candidate.embed_documents(texts), dtype=np.float32)
+    b = np.asarray(reference.embed_documents(texts), dtype=np.float32)
+    cosines = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    return {"min_cosine": float(cosines.min()), "mean_cosine": float(cosines.mean()), "probes": len(texts)}
+
+
+def ensure_agreement(embeddings, model_name: str, backend: str, threshold: float = None) -> dict:
+    """
+    Check a non-torch backend against torch on AGREEMENT_PROBES.
+
+    The result is stored next to the exported model, so torch is only loaded
+    the first time a backend/model pair is used (or when the threshold is
+    raised). Raises EmbeddingAgreementError when the lowest cosine similarity
+    is below ``threshold``.
+    """
+    threshold = settings.embedding_agreement_threshold if threshold is None else threshold
+    path = os.path.join(backend_dir(model_name, backend), AGREEMENT_FILENAME)
+    result: Optional[dict] = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        if result.get("threshold", 1.0) < threshold:
+            result = None
+
+    if result is None:
+        logger.info(f"🔬 Checking {backend} embeddings against torch for {model_name}...")
+        agreement = cosine_agreement(embeddings, _huggingface(model_name))
+        result = {**agreement, "threshold": threshold, "passed": agreement["min_cosine"] >= threshold}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if result["min_cosine"] < threshold:
+        raise EmbeddingAgreementError(
+            f"{backend} embeddings agree with torch down to cosine {result['min_cosine']:.4f}, below {threshold}"
+        )
+    logger.info(f"✅ {backend} embeddings match torch (min cosine {result['min_cosine']:.4f})")
+    return result
+
+
+def load_embeddings(model_name: str = None, backend: str = None, verify: bool = True):
+    """
+    Embedding model for settings.embedding_model on the configured backend.
+
+    Accelerated backends that can't be loaded (missing onnxruntime/optimum) or
+    that fail the agreement check fall back to torch with an error log, so
+    the index and queries always use vectors torch would agree with.
+    """
+    model_name = model_name or settings.embedding_model
+    backend = (backend or settings.embedding_backend).lower()
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}")
+    if backend == "torch":
+        return load_backend(model_name, backend)
+
+    try:
+        embeddings = load_backend(model_name, backend)
+        if verify:
+            ensure_agreement(embeddings, model_name, backend)
+        logger.info(f"⚡ Using the {backend} embedding backend")
+        return embeddings
+    except Exception as e:
+        logger.error(f"❌ {backend} embedding backend unavailable ({e}) - falling back to torch")
+        return _huggingface(model_name)
@@ -0,0 +1,94 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import List, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+    Micro-batches concurrent ``embed_query`` calls into one forward pass.
+
+    A caller's query waits up to ``window_ms`` (or until ``max_batch``
+    queries have gathered) on a single worker thread, which embeds the whole
+    batch with ``embed_documents`` and hands each caller its own vector.
+    Under load the model runs a few large batches instead of many batches of
+    one; a lone query pays at most the window in extra latency.
+
+    Query-specific encode settings of the wrapped model are not applied, so
+    use it with models that embed queries and documents the same way (MiniLM
+    does). ``embed_documents`` is passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, window_ms: float = 2.0, max_batch: int = 16):
+        self.embeddings = embeddings
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.queries = 0
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def embed_query(self, text: str) -> List[float]:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def _collect(self, first) -> List[Tuple[str, Future]]:
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)  # Finish this batch, then stop
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                logger.error(f"❌ Batched query embedding failed ({len(texts)} queries): {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            with self._lock:
+                self.batches += 1
+                self.queries += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "queries": self.queries,
+                "mean_batch_size": self.queries / self.batches if self.batches else 0.0,
+            }
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._worker.join(timeout=5)
@@ -0,0 +1,132 @@
+import os
+import re
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "embeddings.sqlite3"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_chunk_text(text: str) -> str:
+    """Collapse whitespace so re-extracted copies of the same text share a cache key"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def embedding_cache_key(model_name: str, text: str) -> bytes:
+    """Cache key of a chunk: SHA-256 over the model name and normalized text"""
+    return hashlib.sha256(f"{model_name}\0{normalize_chunk_text(text)}".encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    On-disk store of document embeddings keyed by (model, normalized chunk hash).
+
+    Backed by a single SQLite file so it survives between ingestion runs and
+    needs no extra dependency.
+    """
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: Dict[bytes, List[float]]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()],
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that checks an EmbeddingCache before calling the model.
+
+    Identical chunks (after whitespace normalization) are embedded once per
+    run, and chunks seen in earlier runs are not embedded at all. Queries are
+    passed straight through to the wrapped model.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = cache
+        self._seen = set()
+        self.texts = 0
+        self.duplicates = 0
+        self.cache_hits = 0
+        self.embedded = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [embedding_cache_key(self.model_name, text) for text in texts]
+        self.texts += len(texts)
+
+        # First occurrence of each key in this run; repeats are served from the cache
+        unique: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in unique or key in self._seen:
+                self.duplicates += 1
+            else:
+                unique[key] = text
+
+        vectors = self.cache.get_many(list(set(keys)))
+        self.cache_hits += sum(1 for key in unique if key in vectors)
+
+        missing = [key for key in unique if key not in vectors]
+        if missing:
+            computed = dict(zip(missing, self.embeddings.embed_documents([unique[key] for key in missing])))
+            self.cache.put_many(computed)
+            vectors.update(computed)
+            self.embedded += len(missing)
+
+        self._seen.update(unique)
+        return [list(vectors[key]) for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def stats(self) -> dict:
+        lookups = self.texts - self.duplicates
+        return {
+            "texts": self.texts,
+            "duplicates": self.duplicates,
+            "cache_hits": self.cache_hits,
+            "embedded": self.embedded,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,229 @@
+import math
+import logging
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+VECTOR_STORAGE = ("float32", "float16", "int8")
+
+# FAISS scalar quantizers for the compressed storage types
+_SQ_TYPES = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# FAISS wants roughly this many training vectors per IVF list / PQ centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    """How the FAISS index is built (at ingest) and searched (at query time)"""
+    index_type: str = "flat"
+    nlist: int = 0  # IVF lists, 0 = about 4 * sqrt(vectors)
+    nprobe: int = 8  # IVF lists scanned per query
+    hnsw_m: int = 32  # HNSW neighbours per node
+    ef_construction: int = 80
+    ef_search: int = 64  # HNSW candidate list size per query
+    pq_m: int = 48  # PQ sub-quantizers (must divide the embedding dimension)
+    pq_nbits: int = 8
+    vector_storage: str = "float32"  # Stored (and scanned) vector precision: float32, float16 or int8
+    rescore_factor: int = 4  # Compressed storage: candidates per result re-scored exactly (0 = keep no exact copy)
+
+    def __post_init__(self):
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown FAISS index type '{self.index_type}', expected one of {INDEX_TYPES}")
+        if self.vector_storage not in VECTOR_STORAGE:
+            raise ValueError(f"Unknown vector storage '{self.vector_storage}', expected one of {VECTOR_STORAGE}")
+
+    @classmethod
+    def from_settings(cls, settings, **overrides) -> "IndexConfig":
+        values = dict(
+            index_type=settings.faiss_index_type,
+            nlist=settings.faiss_nlist,
+            nprobe=settings.faiss_nprobe,
+            hnsw_m=settings.faiss_hnsw_m,
+            ef_construction=settings.faiss_ef_construction,
+            ef_search=settings.faiss_ef_search,
+            pq_m=settings.faiss_pq_m,
+            pq_nbits=settings.faiss_pq_nbits,
+            vector_storage=settings.faiss_vector_storage,
+            rescore_factor=settings.faiss_rescore_factor,
+        )
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**values)
+
+    def build_params(self) -> dict:
+        """Parameters that shape the stored index (search-time knobs excluded)"""
+        params = asdict(self)
+        params.pop("nprobe")
+        params.pop("ef_search")
+        # How many candidates are re-scored is a search-time knob; whether exact copies are kept is not
+        params["rescore"] = params.pop("rescore_factor") > 0
+        return params
+
+    def resolve_nlist(self, count: int) -> int:
+        nlist = self.nlist or int(4 * math.sqrt(count))
+        return max(1, min(nlist, count // _MIN_POINTS_PER_CENTROID))
+
+
+class RescoringIndex:
+    """
+    A compressed FAISS index whose top candidates are re-scored with exact vectors.
+
+    The float16 / int8 index proposes ``rescore_factor * k`` candidates and
+    their float32 vectors re-rank them, so results match an exact search.
+    The exact vectors are a separate array (memory-mapped from vectors.npy
+    when loaded), so index.faiss stays compressed and a search only reads
+    the rows of its candidates. Anything else is passed to the wrapped index.
+    """
+
+    def __init__(self, index, vectors: np.ndarray, rescore_factor: int = 4):
+        if len(vectors) != index.ntotal:
+            raise ValueError(f"{len(vectors)} exact vectors for an index of {index.ntotal}")
+        self.index = index
+        self.vectors = vectors
+        self.rescore_factor = max(1, rescore_factor)
+
+    def __getattr__(self, name):
+        return getattr(self.index, name)
+
+    def search(self, x: np.ndarray, k: int):
+        queries = np.ascontiguousarray(x, dtype=np.float32).reshape(-1, self.index.d)
+        fetch = min(self.index.ntotal, k * self.rescore_factor)
+        distances = np.full((len(queries), k), np.finfo(np.float32).max, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        if fetch == 0:
+            return distances, ids
+        _, candidates = self.index.search(queries, fetch)
+        for row, (query, found) in enumerate(zip(queries, candidates)):
+            found = np.sort(found[found >= 0])  # Ascending rows read the mmap sequentially
+            exact = ((np.asarray(self.vectors[found], dtype=np.float32) - query) ** 2).sum(axis=1)
+            top = np.argsort(exact, kind="stable")[:k]
+            distances[row, :len(top)] = exact[top]
+            ids[row, :len(top)] = found[top]
+        return distances, ids
+
+
+def base_index_of(index):
+    """The searched FAISS index, unwrapping the exact re-scoring layer of compressed indexes"""
+    return index.index if isinstance(index, RescoringIndex) else index
+
+
+def index_type_of(index) -> str:
+    """Name of a loaded FAISS index in INDEX_TYPES terms"""
+    index = base_index_of(index)
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    return "flat"
+
+
+def vector_storage_of(index) -> str:
+    """Precision of the vectors a loaded index scans, in VECTOR_STORAGE terms"""
+    index = base_index_of(index)
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    sq = getattr(index, "sq", None)
+    if sq is None:
+        return "float32"
+    return next((name for name, qtype in _SQ_TYPES.items() if qtype == sq.qtype), "float32")
+
+
+def has_exact_vectors(index) -> bool:
+    """Whether the original vectors can be recovered from the index (for in-place updates)"""
+    if isinstance(index, RescoringIndex):
+        return True
+    return index_type_of(index) != "ivf_pq" and vector_storage_of(index) == "float32"
+
+
+def build_index(vectors: np.ndarray, config: IndexConfig):
+    """
+    Build an L2 index of the configured type over ``vectors``, in row order.
+
+    Falls back to a flat index when there are too few vectors to train the
+    IVF lists or PQ codebooks. With float16 / int8 storage the vectors are
+    scalar-quantized; unless ``rescore_factor`` is 0 the index is wrapped in
+    a RescoringIndex that keeps ``vectors`` to re-score the top candidates.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dimension = vectors.shape
+    index_type = config.index_type
+
+    if index_type in ("ivf_flat", "ivf_pq") and count < 2 * _MIN_POINTS_PER_CENTROID:
+        logger.warning(f"⚠️ Only {count} vectors - too few to train {index_type}, building a flat index")
+        index_type = "flat"
+    if index_type == "ivf_pq" and (dimension % config.pq_m or count < _MIN_POINTS_PER_CENTROID * (1 << config.pq_nbits)):
+        logger.warning(f"⚠️ Can't train IVF-PQ (m={config.pq_m}, nbits={config.pq_nbits}) on {count} x {dimension} vectors, using IVF-Flat")
+        index_type = "ivf_flat"
+
+    qtype = _SQ_TYPES.get(config.vector_storage)
+    if qtype is not None and index_type == "ivf_pq":
+        logger.warning(f"⚠️ IVF-PQ vectors are already compressed - ignoring {config.vector_storage} storage")
+        qtype = None
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dimension) if qtype is None else faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_L2)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, config.hnsw_m) if qtype is None else faiss.IndexHNSWSQ(dimension, qtype, config.hnsw_m)
+        index.hnsw.efConstruction = config.ef_construction
+    else:
+        nlist = config.resolve_nlist(count)
+        quantizer = faiss.IndexFlatL2(dimension)
+        if index_type == "ivf_pq":
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, config.pq_m, config.pq_nbits)
+        elif qtype is None:
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+        else:
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dimension, nlist, qtype, faiss.METRIC_L2)
+    # IVF lists and scalar quantizer ranges are trained on the vectors themselves
+    if not index.is_trained:
+        index.train(vectors)
+
+    index.add(vectors)
+    if qtype is not None and config.rescore_factor > 0:
+        index = RescoringIndex(index, vectors, config.rescore_factor)
+    apply_search_params(index, config)
+    return index
+
+
+def apply_search_params(index, config: IndexConfig):
+    """Set query-time parameters (nprobe, efSearch, re-scored candidates) on a built or loaded index"""
+    if isinstance(index, RescoringIndex):
+        index.rescore_factor = max(1, config.rescore_factor)
+        index = base_index_of(index)
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = config.ef_search
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(config.nprobe, index.nlist)
+
+
+def to_flat(index) -> Optional[faiss.IndexFlatL2]:
+    """
+    Exact flat copy of an index, for in-place updates during ingestion.
+
+    Returns None for IVF-PQ and for compressed indexes built without exact
+    copies, whose codes can't be turned back into the original vectors.
+    """
+    if not has_exact_vectors(index):
+        return None
+    if isinstance(index, faiss.IndexFlat):
+        return index
+    flat = faiss.IndexFlatL2(index.d)
+    if isinstance(index, RescoringIndex):
+        vectors = np.array(index.vectors, dtype=np.float32)
+    else:
+        if index_type_of(index) == "ivf_flat":
+            index.make_direct_map()
+        vectors = index.reconstruct_n(0, index.ntotal) if index.ntotal else None
+    if vectors is not None and len(vectors):
+        flat.add(vectors)
+    return flat
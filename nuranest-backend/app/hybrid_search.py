@@ -0,0 +1,120 @@
+import os
+import re
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from app.vector_store import DOCSTORE_FILENAME, SPARSE_TABLE, ReadOnlyConnections
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# Words too common in questions to be worth matching on
+_STOPWORDS = frozenset("""
+a about am an and are as at be been but by can could do does did for from had has have how i if in into
+is it its me my of on or our should so than that the their them then there these they this to was we
+were what when where which while who why will with would you your
+""".split())
+
+
+def sparse_query(question: str) -> str:
+    """FTS5 MATCH expression for a question: its content words OR-ed together (BM25 does the weighting)"""
+    terms = []
+    for token in _TOKEN.findall(question.lower()):
+        if len(token) > 1 and token not in _STOPWORDS and token not in terms:
+            terms.append(token)
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class SparseIndex:
+    """BM25 keyword search over the FTS5 table ingest_local.py writes next to the chunks"""
+
+    def __init__(self, docstore_path: str, connections: ReadOnlyConnections = None):
+        self.path = docstore_path
+        self._connections = connections or ReadOnlyConnections(docstore_path)
+
+    @classmethod
+    def open(cls, folder: str) -> Optional["SparseIndex"]:
+        """Sparse index of a saved vectorstore, or None if it was built without one"""
+        path = os.path.join(folder, DOCSTORE_FILENAME)
+        if not os.path.exists(path):
+            return None
+        index = cls(path)
+        found = index._connections.get().execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (SPARSE_TABLE,)
+        ).fetchone()
+        return index if found else None
+
+    def search(self, question: str, k: int) -> List[Document]:
+        query = sparse_query(question)
+        if not query:
+            return []
+        try:
+            rows = self._connections.get().execute(
+                f"SELECT c.id, c.page_content, c.metadata FROM {SPARSE_TABLE} "
+                f"JOIN chunks c ON c.position = {SPARSE_TABLE}.rowid "
+                f"WHERE {SPARSE_TABLE} MATCH ? ORDER BY bm25({SPARSE_TABLE}) LIMIT ?",
+                (query, k),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Sparse search failed for {query!r}: {e}")
+            return []
+        return [Document(id=doc_id, page_content=content, metadata=json.loads(metadata)) for doc_id, content, metadata in rows]
+
+
+def _doc_key(doc: Document) -> str:
+    return doc.id or doc.page_content
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[Document]], k: int = 60) -> List[Document]:
+    """
+    Merge ranked result lists by reciprocal rank fusion.
+
+    Each document scores sum(1 / (k + rank)) over the lists it appears in, so
+    chunks ranked well by both searches come first. Ties keep first-seen order.
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            key = _doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [docs[key] for key in ordered]
+
+
+class HybridRetriever:
+    """
+    Dense (FAISS) + sparse (BM25) retrieval fused with reciprocal rank fusion.
+
+    The keyword search is started on a worker thread before the question is
+    embedded, so it runs while the embedding model and FAISS search do and
+    adds little to the dense-only latency.
+    """
+
+    def __init__(self, vectorstore, sparse: SparseIndex, fetch_k: int = 20, rrf_k: int = 60, max_workers: int = 4):
+        self.vectorstore = vectorstore
+        self.sparse = sparse
+        self.fetch_k = fetch_k
+        self.rrf_k = rrf_k
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sparse-search")
+
+    def search(self, question: str, embed: Callable[[], List[float]], k: int) -> List[Document]:
+        fetch_k = max(k, self.fetch_k)
+        sparse_future = self._executor.submit(self.sparse.search, question, fetch_k)
+        dense_docs = self.vectorstore.similarity_search_by_vector(embed(), k=fetch_k)
+        try:
+            sparse_docs = sparse_future.result()
+        except Exception as e:
+            logger.warning(f"⚠️ Sparse search failed, using dense results only: {e}")
+            sparse_docs = []
+        return reciprocal_rank_fusion([dense_docs, sparse_docs], self.rrf_k)[:k]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,143 @@
+import os
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "ingest_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_ids_for(filename: str, sha256: str, count: int) -> List[str]:
+    """Stable vectorstore IDs for the chunks of a file (identical copies under different names don't collide)"""
+    prefix = hashlib.sha256(f"{filename}:{sha256}".encode("utf-8")).hexdigest()[:16]
+    return [f"{prefix}-{i:05d}" for i in range(count)]
+
+
+@dataclass
+class ManifestEntry:
+    sha256: str
+    pages: int
+    chunk_ids: List[str]
+    # Files whose chunks absorbed near-duplicates of this file's chunks
+    duplicate_of: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IngestPlan:
+    """What an incremental run has to do to bring the index up to date"""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Unchanged files re-ingested because their near-duplicate chunks lived in a changed file
+    dependent: List[str] = field(default_factory=list)
+
+    @property
+    def to_load(self) -> List[str]:
+        return sorted(self.added + self.changed + self.dependent)
+
+    @property
+    def to_delete(self) -> List[str]:
+        return sorted(self.changed + self.removed + self.dependent)
+
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class IngestManifest:
+    """
+    Per-PDF content hashes and chunk IDs, stored next to the FAISS index.
+
+    ``settings`` records what the vectors were built with (embedding model,
+    chunking); if any of it differs the index has to be rebuilt from scratch.
+    ``index`` records the FAISS index type and build parameters, plus the
+    type actually ``built``.
+    """
+
+    def __init__(self, settings: dict, files: Dict[str, ManifestEntry] = None, index: dict = None):
+        self.settings = settings
+        self.files: Dict[str, ManifestEntry] = files or {}
+        self.index: dict = index or {"index_type": "flat", "built": "flat"}
+
+    @classmethod
+    def load(cls, index_dir: str):
+        """Read the manifest of an index, or None if there is none"""
+        path = os.path.join(index_dir, MANIFEST_FILENAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                logger.warning(f"⚠️ Ignoring manifest with unsupported version {data.get('version')}")
+                return None
+            files = {name: ManifestEntry(**entry) for name, entry in data["files"].items()}
+            return cls(data["settings"], files, data.get("index"))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable manifest {path}: {e}")
+            return None
+
+    def save(self, index_dir: str):
+        """Write the manifest atomically so a crash never leaves a half-written file"""
+        path = os.path.join(index_dir, MANIFEST_FILENAME)
+        data = {
+            "version": MANIFEST_VERSION,
+            "settings": self.settings,
+            "index": self.index,
+            "files": {
+                name: {
+                    "sha256": entry.sha256,
+                    "pages": entry.pages,
+                    "chunk_ids": entry.chunk_ids,
+                    "duplicate_of": entry.duplicate_of,
+                }
+                for name, entry in sorted(self.files.items())
+            },
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def plan(self, hashes: Dict[str, str]) -> IngestPlan:
+        """Compare current file hashes with the manifest"""
+        plan = IngestPlan()
+        for name, sha256 in sorted(hashes.items()):
+            entry = self.files.get(name)
+            if entry is None:
+                plan.added.append(name)
+            elif entry.sha256 != sha256:
+                plan.changed.append(name)
+            else:
+                plan.unchanged.append(name)
+        plan.removed = sorted(name for name in self.files if name not in hashes)
+
+        # A file whose duplicates were collapsed into a re-indexed file has to be re-indexed too
+        invalidated = set(plan.changed + plan.removed)
+        while True:
+            dependent = [name for name in plan.unchanged if invalidated & set(self.files[name].duplicate_of)]
+            if not dependent:
+                break
+            for name in dependent:
+                plan.unchanged.remove(name)
+                plan.dependent.append(name)
+            invalidated.update(dependent)
+        plan.dependent.sort()
+        return plan
+
+    def chunk_ids(self, names: List[str]) -> List[str]:
+        """Vectorstore IDs of every chunk belonging to the given files"""
+        return [chunk_id for name in names if name in self.files for chunk_id in self.files[name].chunk_ids]
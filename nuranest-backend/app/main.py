@@ -2,13 +2,16 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 
 from .config import settings
 from .routers import api_router
+from .rule_store import rule_store
 from .services import pregnancy_service
+from .startup import startup
 
 # Configure logging
 logging.basicConfig(
@@ -25,21 +28,33 @@ async def lifespan(app: FastAPI):
     logger.info(f"📡 Server will be available at: http://{settings.host}:{settings.port}")
     logger.info(f"📚 API Documentation: http://{settings.host}:{settings.port}/docs")
     
-    # Initialize the AI service
-    logger.info("🔧 Initializing AI service...")
+    # Compile the clinical rules off the event loop, so no request has to
     try:
-        success = await pregnancy_service.initialize()
-        if success:
-            logger.info("✅ AI service initialized successfully")
-        else:
-            logger.warning("⚠️ AI service initialization failed - will need manual initialization")
+        await asyncio.to_thread(rule_store.current)
     except Exception as e:
-        logger.error(f"❌ AI service initialization error: {e}")
+        logger.error(f"❌ Clinical rules failed to load: {e}")
+    
+    # Initialize the AI service
+    if settings.background_warmup:
+        # Accept connections immediately; /readyz reports when the model and index are loaded
+        logger.info("🔧 Warming up AI service in the background...")
+        pregnancy_service.start_warmup()
+    else:
+        logger.info("🔧 Initializing AI service...")
+        try:
+            success = await pregnancy_service.start_warmup()
+            if success:
+                logger.info("✅ AI service initialized successfully")
+            else:
+                logger.warning("⚠️ AI service initialization failed - will need manual initialization")
+        except Exception as e:
+            logger.error(f"❌ AI service initialization error: {e}")
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Nuranest Pregnancy AI API...")
+    pregnancy_service.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -61,6 +76,17 @@ app.add_middleware(
     allow_headers=settings.cors_headers,
 )
 
+# Startup tracking middleware
+@app.middleware("http")
+async def track_startup(request: Request, call_next):
+    first_connection = startup.record("first_connection")
+    if first_connection is not None:
+        logger.info(f"🔌 First connection accepted {first_connection:.2f}s after process start")
+    # Servers that skip the lifespan (some serverless runtimes) warm up on the first request
+    if settings.background_warmup:
+        pregnancy_service.start_warmup()
+    return await call_next(request)
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -81,7 +107,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "error": exc.detail,
             "status_code": exc.status_code,
             "timestamp": time.time()
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(RequestValidationError)
@@ -124,6 +151,23 @@ async def root():
         "status": "running"
     }
 
+# Health probes
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok", **startup.snapshot()}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: the embedding model and vector index are loaded"""
+    if pregnancy_service.is_initialized:
+        return {"status": "ready", **startup.snapshot()}
+    status = "warming" if pregnancy_service.is_warming else "unavailable"
+    content = {"status": status, **startup.snapshot()}
+    if pregnancy_service.initialization_error:
+        content["error"] = pregnancy_service.initialization_error
+    return JSONResponse(status_code=503, content=content)
+
 # Include API routes
 app.include_router(api_router)
 
@@ -22,8 +22,10 @@ class QuestionResponse(BaseModel):
     classifications: list = Field(None, description="List of classified symptoms from the question")
     timeline_results: list = Field(None, description="List of conditions matched by week in the pregnancy timeline")
     combination_results: list = Field(None, description="List of inferred symptom combinations based on user input")
+    partial_combinations: list = Field(None, description="Symptom combinations that are only partly present, ranked by overlapping symptoms")
     sources: Optional[list] = Field(None, description="List of sources used to generate the answer")
     confidence_score: Optional[float] = Field(None, description="Confidence score of the answer")
+    rules_only: bool = Field(False, description="True when only the rule-engine assessment is included because the AI model is still loading")
     processing_time: float = Field(..., description="Time taken to process the question in seconds")
     timestamp: datetime = Field(default_factory=datetime.now, description="Timestamp of the response")
     sources: Optional[List[str]] = Field(None, description="List of sources used for the answer")
@@ -0,0 +1,85 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_TOKEN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 5) -> set:
+    """Hashed word n-grams of a text (lowercased, punctuation and whitespace ignored)"""
+    words = _TOKEN.findall(text.lower())
+    if len(words) <= size:
+        grams = [" ".join(words)]
+    else:
+        grams = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return {zlib.crc32(gram.encode("utf-8")) & _MERSENNE_PRIME for gram in grams}
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` seeded universal hash functions"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        values = np.fromiter(shingles(text), dtype=np.uint64)
+        return ((self._a * values + self._b) % _MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures.
+
+    Signatures are split into ``bands`` bands; two texts become candidates
+    when any band matches exactly, and a candidate counts as a near-duplicate
+    when the estimated Jaccard similarity of their shingles is at least
+    ``threshold``. The defaults (16 bands x 8 rows) catch pairs above ~0.7
+    with high probability while verifying few false candidates.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, seed)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """
+        Register a text, unless it nearly duplicates one already registered.
+
+        Returns the key of the matching earlier text, or None if the text
+        was new and has been added under ``key``.
+        """
+        signature = self.hasher.signature(text)
+        band_keys = self._band_keys(signature)
+
+        checked = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            for candidate in bucket.get(band_key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                    return candidate
+
+        self._signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, band_keys):
+            bucket[band_key].append(key)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._signatures)
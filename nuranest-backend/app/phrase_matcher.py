@@ -0,0 +1,58 @@
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of phrases.
+
+    ``find_all`` reports every occurrence of every phrase (including
+    overlapping ones) in a single pass over the text, so its cost depends on
+    the text length and the number of matches, not on how many phrases exist.
+    Matching is plain substring matching, like Python's ``in``.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = list(dict.fromkeys(p for p in phrases if p))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[tuple] = [()]
+
+        for phrase_id, phrase in enumerate(self.phrases):
+            node = 0
+            for char in phrase:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = next_node
+            self._out[node] += (phrase_id,)
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Map each phrase found in ``text`` to the start positions of its occurrences"""
+        goto, fail, out, phrases = self._goto, self._fail, self._out, self.phrases
+        found: Dict[str, List[int]] = {}
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for phrase_id in out[node]:
+                phrase = phrases[phrase_id]
+                found.setdefault(phrase, []).append(index - len(phrase) + 1)
+        return found
@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from app.combo_checker import infer_symptom_combinations, rank_partial_combinations
+from app.rule_index import SymptomMatches
+from app.rule_store import CompiledRules, rule_store
+from app.symptom_classifier import classify_symptom
+from app.symptom_matcher import match_symptoms
+from app.timeline_checker import check_symptoms_for_age
+from app.timeline_parser import GestationalAge, extract_gestational_age, extract_trimester
+
+
+def build_risk_table(symptom_combinations) -> list:
+    """Summarise inferred symptom combinations as risk table rows"""
+    risk_table = []
+    for combo in symptom_combinations:
+        condition = combo["condition"]
+        urgent = any(name in condition.lower() for name in ["preeclampsia", "ectopic pregnancy"])
+        risk_table.append({
+            "Symptoms": ", ".join(combo["matched_symptoms"]),
+            "Risk Condition": condition,
+            "Recommended Action": "Seek immediate medical attention" if urgent else "Monitor and consult OB-GYN"
+        })
+    return risk_table
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """
+    Rule-engine analysis of one question, computed once per request.
+
+    Every layer (service, agent, answer cache, topic filter, CLI) reads from
+    this object instead of re-running the analyzers on the same text.
+    """
+    text: str
+    lowered: str
+    rules: CompiledRules = field(repr=False, compare=False)
+    matches: SymptomMatches = field(repr=False, compare=False)
+    gestational_age: Optional[GestationalAge]
+    trimester: Optional[int]
+    classifications: Tuple[dict, ...]
+    combinations: Tuple[dict, ...]
+    partial_combinations: Tuple[dict, ...]
+    timeline_results: Tuple[dict, ...]
+    risk_table: Tuple[dict, ...]
+
+    @property
+    def week(self) -> Optional[int]:
+        return self.gestational_age.weeks if self.gestational_age else None
+
+    def cache_guard(self) -> tuple:
+        """What must match, besides similar wording, for two questions to share a cached answer"""
+        return (
+            self.rules.content_hash,
+            self.gestational_age,
+            self.trimester,
+            tuple(sorted(c["matched_phrase"] for c in self.classifications)),
+            # Combination and timeline phrases too: "headache" vs "headache with swelling" differ clinically
+            tuple(sorted(self.matches)),
+        )
+
+
+def analyze_query(question: str, rules: Optional[CompiledRules] = None) -> QueryAnalysis:
+    """Run every rule-engine analyzer on a question exactly once"""
+    # One rule snapshot per request, so a concurrent reload can't mix versions
+    rules = rules or rule_store.current()
+    lowered = question.lower()
+
+    # One pass over the question finds the phrases of every rule table
+    matches = match_symptoms(lowered, rules)
+
+    # Gestational age (e.g. "20 weeks", "20w3d") or trimester if applicable
+    age = extract_gestational_age(lowered)
+    trimester = extract_trimester(lowered)
+
+    combinations = infer_symptom_combinations(lowered, matches, rules)
+    return QueryAnalysis(
+        text=question,
+        lowered=lowered,
+        rules=rules,
+        matches=matches,
+        gestational_age=age,
+        trimester=trimester,
+        classifications=tuple(classify_symptom(lowered, matches, rules)),
+        combinations=tuple(combinations),
+        partial_combinations=tuple(rank_partial_combinations(lowered, matches, rules=rules)),
+        timeline_results=tuple(check_symptoms_for_age(age, trimester, lowered, matches, rules)),
+        risk_table=tuple(build_risk_table(combinations)),
+    )
+
+
+def print_risk_summary(analysis: QueryAnalysis):
+    """Print the rule-engine findings for terminal display"""
+    if analysis.classifications:
+        print("\n⚠️ Symptom Risk Summary:")
+        for c in analysis.classifications:
+            print(f"- '{c['matched_phrase']}' → Risk: {c['risk']}, Condition: {c['condition']}")
+            print(f"  Suggested Action: {c['action']}")
+
+    if analysis.timeline_results:
+        print("\n📅 Timeline-Aware Risk(s):")
+        when = f"Week {analysis.gestational_age}" if analysis.gestational_age else f"Trimester {analysis.trimester}"
+        for res in analysis.timeline_results:
+            print(f"- {when}: '{res['symptom']}' → {res['condition']} ({res['risk']})")
+            print(f"  Action: {res['action']}")
+
+    if analysis.combinations:
+        print("\n🧩 Inferred Risk Combination(s):")
+        for res in analysis.combinations:
+            print(f"- Symptoms: {', '.join(res['matched_symptoms'])} → {res['condition']} ({res['risk']})")
+            print(f"  Urgent Action: {res['action']}")
+    else:
+        print("\n✅ No high-risk symptom combinations detected.")
@@ -0,0 +1,98 @@
+import logging
+import threading
+from contextvars import ContextVar
+from typing import List, Optional
+
+from app.chunk_display import source_filename
+
+logger = logging.getLogger(__name__)
+
+# The context for the question currently being processed (if any)
+_current_context: ContextVar[Optional["RetrievalContext"]] = ContextVar("retrieval_context", default=None)
+
+
+class RetrievalStats:
+    """Process-wide counters for query embeddings and vectorstore searches"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.embeddings = 0
+        self.searches = 0
+
+    def record_embedding(self):
+        with self._lock:
+            self.embeddings += 1
+
+    def record_search(self):
+        with self._lock:
+            self.searches += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"embeddings": self.embeddings, "searches": self.searches}
+
+
+retrieval_stats = RetrievalStats()
+
+
+def current_retrieval_context() -> Optional["RetrievalContext"]:
+    """Return the retrieval context of the question being processed, if any"""
+    return _current_context.get()
+
+
+class RetrievalContext:
+    """
+    Retrieval state for a single question.
+
+    The query is embedded and the vectorstore searched (dense, or hybrid with
+    BM25) at most once; the agent tool, source extraction and any later
+    consumer share the same documents.
+    """
+
+    def __init__(self, question: str, agent):
+        self.question = question
+        self._agent = agent
+        self._lock = threading.RLock()
+        self._embedding: Optional[List[float]] = None
+        self._documents: Optional[list] = None
+        self._token = None
+        self.embed_count = 0
+        self.search_count = 0
+
+    def __enter__(self) -> "RetrievalContext":
+        self._token = _current_context.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_context.reset(self._token)
+        self._token = None
+        return False
+
+    def embedding(self) -> List[float]:
+        """Embed the question (once)"""
+        with self._lock:
+            if self._embedding is None:
+                self._embedding = self._agent.embeddings.embed_query(self.question)
+                self.embed_count += 1
+                retrieval_stats.record_embedding()
+            return self._embedding
+
+    def documents(self) -> list:
+        """Search the vectorstore for the question (once)"""
+        with self._lock:
+            if self._documents is None:
+                self._documents = self._agent.retrieve(self.question, self.embedding)
+                self.search_count += 1
+                retrieval_stats.record_search()
+            return self._documents
+
+    def sources(self, limit: int = 3) -> List[str]:
+        """Filenames of the documents retrieved for the question"""
+        try:
+            return [source_filename(doc) for doc in self.documents()[:limit]]
+        except Exception as e:
+            logger.error(f"Error getting sources: {e}")
+            return []
+
+    def stats(self) -> dict:
+        return {"embeddings": self.embed_count, "searches": self.search_count}
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 import logging
+import secrets
 
 from .models import (
     QuestionRequest, 
     QuestionResponse
 )
 from .services import pregnancy_service
+from .concurrency import ServiceOverloadedError
+from .rule_store import RuleValidationError, rule_store
 from .config import settings
 
 logger = logging.getLogger(__name__)
@@ -14,13 +19,28 @@ logger = logging.getLogger(__name__)
 # Create routers
 api_router = APIRouter(prefix=settings.api_prefix)
 ai_router = APIRouter(prefix="/ai", tags=["AI"])
+admin_router = APIRouter(prefix="/admin", tags=["Admin"])
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only with the configured admin token"""
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them."
+        )
+    if not secrets.compare_digest(x_admin_token or "", settings.admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token"
+        )
 
 # AI endpoints
 @ai_router.post("/ask", response_model=QuestionResponse)
 async def ask_question(request: QuestionRequest):
     """Ask a pregnancy health question"""
     try:
-        if not pregnancy_service.is_initialized:
+        # While warming up, the service answers from the rule engines alone
+        if not pregnancy_service.is_initialized and not pregnancy_service.is_warming:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="AI service not initialized. Please initialize the service first."
@@ -32,6 +52,12 @@ async def ask_question(request: QuestionRequest):
         
         return response
         
+    except ServiceOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -41,5 +67,56 @@ async def ask_question(request: QuestionRequest):
             detail=f"Failed to process question: {str(e)}"
         )
 
-# Include AI router in the main API router
-api_router.include_router(ai_router) 
\ No newline at end of file
+@ai_router.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest):
+    """Ask a pregnancy health question and stream the answer as Server-Sent Events.
+
+    Events: ``risk`` (rule-engine assessment), ``token`` (answer text as it is
+    generated), ``done`` (formatted answer, sources and timing) or ``error``.
+    """
+    if not pregnancy_service.is_initialized and not pregnancy_service.is_warming:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service not initialized. Please initialize the service first."
+        )
+    
+    if pregnancy_service.limiter.is_full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many questions are being processed. Please retry shortly.",
+            headers={"Retry-After": str(pregnancy_service.limiter.retry_after)}
+        )
+    
+    return StreamingResponse(
+        pregnancy_service.stream_question(request.question),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Admin endpoints
+@admin_router.get("/rules", dependencies=[Depends(require_admin)])
+async def get_rules():
+    """Show the clinical rule version currently in use"""
+    return rule_store.current().summary()
+
+@admin_router.post("/rules/reload", dependencies=[Depends(require_admin)])
+async def reload_rules():
+    """Reload the clinical rule file; in-flight requests finish on the previous version"""
+    try:
+        rules = await run_in_threadpool(rule_store.reload)
+        return {"status": "reloaded", **rules.summary()}
+    except RuleValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors
+        )
+    except Exception as e:
+        logger.error(f"Error reloading rules: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reload rules: {str(e)}"
+        )
+
+# Include AI and admin routers in the main API router
+api_router.include_router(ai_router)
+api_router.include_router(admin_router) 
\ No newline at end of file
@@ -0,0 +1,144 @@
+from typing import Dict, List, Tuple
+
+# Phrase -> start positions of each occurrence in the lowercased input
+SymptomMatches = Dict[str, List[int]]
+
+
+class CombinationRuleIndex:
+    """
+    Symptom combination rules compiled to bitmasks.
+
+    Every distinct symptom gets a bit and every rule becomes the mask of its
+    symptoms, so a rule matches when ``mask & detected == mask``. Only rules
+    that share at least one detected symptom are looked at, which keeps
+    evaluation proportional to what the question mentions rather than to the
+    size of the rule table.
+    """
+
+    def __init__(self, rules: List[dict]):
+        self.rules = rules
+        self.symptom_bits: Dict[str, int] = {}
+        self.masks: List[int] = []
+        self.sizes: List[int] = []
+        self._rules_by_bit: Dict[int, List[int]] = {}
+
+        for index, rule in enumerate(rules):
+            mask = 0
+            for symptom in rule["symptoms"]:
+                bit = self.symptom_bits.setdefault(symptom, len(self.symptom_bits))
+                mask |= 1 << bit
+            self.masks.append(mask)
+            self.sizes.append(mask.bit_count())
+            for bit in self._bits(mask):
+                self._rules_by_bit.setdefault(bit, []).append(index)
+
+    @staticmethod
+    def _bits(mask: int):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def detected_mask(self, matches: SymptomMatches) -> int:
+        """Bitset of the rule symptoms present in the matches"""
+        mask = 0
+        for symptom in matches:
+            bit = self.symptom_bits.get(symptom)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def candidates(self, detected: int) -> List[int]:
+        """Indexes (in rule order) of rules sharing at least one detected symptom"""
+        found = set()
+        for bit in self._bits(detected):
+            found.update(self._rules_by_bit.get(bit, ()))
+        return sorted(found)
+
+    def full_matches(self, detected: int) -> List[int]:
+        masks = self.masks
+        return [i for i in self.candidates(detected) if masks[i] & detected == masks[i]]
+
+    def partial_matches(self, detected: int, min_overlap: int = 1) -> List[tuple]:
+        """(rule index, overlap) for incomplete matches, most overlapping symptoms first"""
+        ranked = []
+        for index in self.candidates(detected):
+            overlap = (self.masks[index] & detected).bit_count()
+            if min_overlap <= overlap < self.sizes[index]:
+                ranked.append((index, overlap))
+        ranked.sort(key=lambda item: (-item[1], -item[1] / self.sizes[item[0]], item[0]))
+        return ranked
+
+
+MAX_GESTATIONAL_WEEK = 42
+
+# Inclusive gestational week ranges of each trimester
+TRIMESTER_WEEKS = {1: (1, 13), 2: (14, 27), 3: (28, MAX_GESTATIONAL_WEEK)}
+
+# Symptom phrase -> (rule index, position in the rule) for the rules of one slot
+PhraseHits = Dict[str, List[Tuple[int, int]]]
+
+
+def rule_day_range(rule: dict) -> Tuple[int, int]:
+    """
+    Inclusive range of gestational days a rule applies to.
+
+    Rules give either ``trimester`` or ``min_week``/``max_week``, optionally
+    refined to the day with ``min_day``/``max_day`` (0-6, days into the week).
+    """
+    if "trimester" in rule:
+        min_week, max_week = TRIMESTER_WEEKS[rule["trimester"]]
+    else:
+        min_week, max_week = rule["min_week"], rule["max_week"]
+    return min_week * 7 + rule.get("min_day", 0), max_week * 7 + rule.get("max_day", 6)
+
+
+class TimelineIndex:
+    """
+    Timeline rules precomputed per gestational day.
+
+    Each day from 0 to the last week covered maps to the phrases of the rules
+    that apply on that day, so a lookup only touches the relevant rules. Days
+    with the same applicable rules share one phrase table.
+    """
+
+    def __init__(self, rules: List[dict]):
+        self.rules = rules
+        ranges = [rule_day_range(rule) for rule in rules]
+        last_week = max([MAX_GESTATIONAL_WEEK] + [end // 7 for _, end in ranges])
+        self.days = (last_week + 1) * 7
+
+        shared: Dict[tuple, PhraseHits] = {}
+        self._by_day: List[PhraseHits] = []
+        for day in range(self.days):
+            applicable = tuple(i for i, (start, end) in enumerate(ranges) if start <= day <= end)
+            if applicable not in shared:
+                shared[applicable] = self._phrase_hits(applicable)
+            self._by_day.append(shared[applicable])
+
+        self._by_trimester: Dict[int, PhraseHits] = {}
+        for trimester, (first_week, last_week) in TRIMESTER_WEEKS.items():
+            start, end = first_week * 7, last_week * 7 + 6
+            applicable = tuple(i for i, (lo, hi) in enumerate(ranges) if lo <= end and start <= hi)
+            self._by_trimester[trimester] = self._phrase_hits(applicable)
+
+    def _phrase_hits(self, rule_indexes: tuple) -> PhraseHits:
+        hits: PhraseHits = {}
+        for index in rule_indexes:
+            for position, symptom in enumerate(self.rules[index]["symptoms"]):
+                hits.setdefault(symptom, []).append((index, position))
+        return hits
+
+    def for_day(self, day: int) -> PhraseHits:
+        return self._by_day[day] if 0 <= day < self.days else {}
+
+    def for_week(self, week: int, days: int = 0) -> PhraseHits:
+        return self.for_day(week * 7 + days)
+
+    def for_trimester(self, trimester: int) -> PhraseHits:
+        return self._by_trimester.get(trimester, {})
+
+    @staticmethod
+    def lookup(hits_by_phrase: PhraseHits, matches: SymptomMatches) -> List[Tuple[int, int]]:
+        """(rule index, symptom position) of every matched phrase, in rule order"""
+        return sorted(hit for phrase in matches for hit in hits_by_phrase.get(phrase, ()))
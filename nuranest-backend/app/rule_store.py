@@ -0,0 +1,284 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.phrase_matcher import PhraseMatcher
+from app.rule_index import CombinationRuleIndex, TimelineIndex, TRIMESTER_WEEKS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "rules", "clinical_rules.json")
+
+
+class RuleValidationError(ValueError):
+    """Raised when a clinical rule file is malformed"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("Invalid clinical rules:\n- " + "\n- ".join(errors))
+        self.errors = errors
+
+
+@dataclass
+class CompiledRules:
+    """One immutable, fully compiled version of the clinical rules"""
+    version: str
+    content_hash: str
+    symptom_keywords: Dict[str, dict]
+    symptom_combinations: List[dict]
+    timeline_rules: List[dict]
+    triage_questions: List[dict]
+    matcher: PhraseMatcher
+    keyword_order: Dict[str, int]
+    combination_index: CombinationRuleIndex
+    timeline_index: TimelineIndex
+    loaded_at: float = field(default_factory=time.time)
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "content_hash": self.content_hash,
+            "symptom_keywords": len(self.symptom_keywords),
+            "symptom_combinations": len(self.symptom_combinations),
+            "timeline_rules": len(self.timeline_rules),
+            "triage_questions": len(self.triage_questions),
+            "phrases": len(self.matcher.phrases),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def _check_text(value, path: str, errors: List[str]):
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"{path} must be a non-empty string")
+
+
+def _check_outcome(rule: dict, path: str, errors: List[str]):
+    for key in ("risk", "condition", "action"):
+        _check_text(rule.get(key), f"{path}.{key}", errors)
+
+
+def _check_symptoms(rule: dict, path: str, errors: List[str]):
+    symptoms = rule.get("symptoms")
+    if not isinstance(symptoms, list) or not symptoms:
+        errors.append(f"{path}.symptoms must be a non-empty list")
+        return
+    for i, symptom in enumerate(symptoms):
+        _check_text(symptom, f"{path}.symptoms[{i}]", errors)
+
+
+def validate_rules(data: dict) -> None:
+    """Check the structure of a rule document, reporting every problem at once"""
+    errors: List[str] = []
+    if not isinstance(data, dict):
+        raise RuleValidationError(["the rule document must be an object"])
+
+    _check_text(data.get("version"), "version", errors)
+
+    keywords = data.get("symptom_keywords")
+    if not isinstance(keywords, dict):
+        errors.append("symptom_keywords must be an object")
+    else:
+        for phrase, outcome in keywords.items():
+            _check_text(phrase, "symptom_keywords key", errors)
+            if not isinstance(outcome, dict):
+                errors.append(f"symptom_keywords['{phrase}'] must be an object")
+            else:
+                _check_outcome(outcome, f"symptom_keywords['{phrase}']", errors)
+
+    combinations = data.get("symptom_combinations")
+    if not isinstance(combinations, list):
+        errors.append("symptom_combinations must be a list")
+    else:
+        for i, rule in enumerate(combinations):
+            path = f"symptom_combinations[{i}]"
+            if not isinstance(rule, dict):
+                errors.append(f"{path} must be an object")
+                continue
+            _check_symptoms(rule, path, errors)
+            _check_outcome(rule, path, errors)
+
+    timeline = data.get("timeline_rules")
+    if not isinstance(timeline, list):
+        errors.append("timeline_rules must be a list")
+    else:
+        for i, rule in enumerate(timeline):
+            path = f"timeline_rules[{i}]"
+            if not isinstance(rule, dict):
+                errors.append(f"{path} must be an object")
+                continue
+            _check_symptoms(rule, path, errors)
+            _check_outcome(rule, path, errors)
+            if "trimester" in rule:
+                if rule["trimester"] not in TRIMESTER_WEEKS:
+                    errors.append(f"{path}.trimester must be one of {sorted(TRIMESTER_WEEKS)}")
+            else:
+                min_week, max_week = rule.get("min_week"), rule.get("max_week")
+                if not isinstance(min_week, int) or not isinstance(max_week, int):
+                    errors.append(f"{path} needs integer min_week and max_week (or a trimester)")
+                elif not 0 <= min_week <= max_week:
+                    errors.append(f"{path} week range {min_week}-{max_week} is invalid")
+            for key in ("min_day", "max_day"):
+                if key in rule and rule[key] not in range(7):
+                    errors.append(f"{path}.{key} must be between 0 and 6")
+
+    questions = data.get("triage_questions")
+    if not isinstance(questions, list):
+        errors.append("triage_questions must be a list")
+    else:
+        for i, question in enumerate(questions):
+            path = f"triage_questions[{i}]"
+            if not isinstance(question, dict):
+                errors.append(f"{path} must be an object")
+                continue
+            _check_text(question.get("key"), f"{path}.key", errors)
+            _check_text(question.get("question"), f"{path}.question", errors)
+
+    if errors:
+        raise RuleValidationError(errors)
+
+
+def _normalize_phrase(phrase: str, path: str) -> str:
+    # Questions are lowercased before matching, so phrases must be too
+    normalized = phrase.strip().lower()
+    if normalized != phrase:
+        logger.warning(f"⚠️ Rule phrase {path} '{phrase}' normalized to '{normalized}'")
+    return normalized
+
+
+def compile_rules(data: dict, content_hash: str) -> CompiledRules:
+    """Validate a rule document and build the matching structures"""
+    validate_rules(data)
+
+    symptom_keywords = {
+        _normalize_phrase(phrase, "symptom_keywords"): dict(outcome)
+        for phrase, outcome in data["symptom_keywords"].items()
+    }
+    symptom_combinations = [
+        {**rule, "symptoms": [_normalize_phrase(s, f"symptom_combinations[{i}]") for s in rule["symptoms"]]}
+        for i, rule in enumerate(data["symptom_combinations"])
+    ]
+    timeline_rules = [
+        {**rule, "symptoms": [_normalize_phrase(s, f"timeline_rules[{i}]") for s in rule["symptoms"]]}
+        for i, rule in enumerate(data["timeline_rules"])
+    ]
+
+    # One automaton for every phrase of the three rule tables
+    matcher = PhraseMatcher(
+        list(symptom_keywords)
+        + [symptom for rule in symptom_combinations for symptom in rule["symptoms"]]
+        + [symptom for rule in timeline_rules for symptom in rule["symptoms"]]
+    )
+
+    return CompiledRules(
+        version=data["version"],
+        content_hash=content_hash,
+        symptom_keywords=symptom_keywords,
+        symptom_combinations=symptom_combinations,
+        timeline_rules=timeline_rules,
+        triage_questions=[dict(q) for q in data["triage_questions"]],
+        matcher=matcher,
+        keyword_order={phrase: index for index, phrase in enumerate(symptom_keywords)},
+        combination_index=CombinationRuleIndex(symptom_combinations),
+        timeline_index=TimelineIndex(timeline_rules),
+    )
+
+
+def _parse_rules(raw: bytes, path: str) -> dict:
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+        return yaml.safe_load(raw)
+    return json.loads(raw)
+
+
+class RuleStore:
+    """
+    Holds the current compiled clinical rules and swaps them atomically.
+
+    Rules come from a versioned JSON/YAML file, compiled on load and skipped
+    when the content hash is unchanged. The file is re-checked at most every
+    ``check_interval`` seconds (0 disables watching) on a background thread,
+    which keeps serving the previous rules until the new ones are compiled;
+    ``reload()`` can be called explicitly. Callers take one snapshot with
+    ``current()`` per request and keep using it, so a reload never changes the
+    rules under an in-flight request.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 5.0):
+        self.path = path or DEFAULT_RULES_PATH
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._rules: Optional[CompiledRules] = None
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._refresher: Optional[threading.Thread] = None
+
+    def current(self) -> CompiledRules:
+        """The active rules; a changed file is recompiled in the background meanwhile"""
+        rules = self._rules
+        if rules is None:
+            return self.reload()  # Nothing to serve yet (the API preloads at startup)
+        if self.check_interval and time.monotonic() - self._last_check >= self.check_interval:
+            self._last_check = time.monotonic()
+            self._start_refresh()
+        return rules
+
+    def _start_refresh(self):
+        """Check the file on a background thread, unless a check is already running"""
+        refresher = self._refresher
+        if refresher is not None and refresher.is_alive():
+            return
+        self._refresher = threading.Thread(target=self._reload_if_changed, name="rule-reload", daemon=True)
+        self._refresher.start()
+
+    def wait_for_refresh(self, timeout: Optional[float] = None):
+        """Block until a background check (if any) has finished"""
+        refresher = self._refresher
+        if refresher is not None:
+            refresher.join(timeout)
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            logger.error(f"❌ Cannot stat rule file {self.path}: {e}")
+            return
+        if mtime != self._mtime:
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"❌ Rule reload failed, keeping version {self._rules.version}: {e}")
+
+    def reload(self) -> CompiledRules:
+        """Load, validate and compile the rule file, then swap it in"""
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            content_hash = hashlib.sha256(raw).hexdigest()
+
+            if self._rules is not None and self._rules.content_hash == content_hash:
+                self._mtime = mtime
+                return self._rules
+
+            start = time.perf_counter()
+            rules = compile_rules(_parse_rules(raw, self.path), content_hash)
+            logger.info(f"🧮 Compiled clinical rules v{rules.version} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+            previous = self._rules
+            self._rules = rules
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+            if previous is not None:
+                logger.info(f"🔄 Clinical rules reloaded: v{previous.version} → v{rules.version}")
+            return rules
+
+
+rule_store = RuleStore(
+    path=settings.rules_path,
+    check_interval=settings.rules_check_interval,
+)
@@ -1,39 +1,81 @@
 import time
+import json
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime
 
-from .agents import PregnancyHealthAgent
 from .models import QuestionResponse
 from .config import settings
+from .concurrency import InflightLimiter, ServiceOverloadedError, SingleFlight
+from .startup import startup
 
-from app.symptom_classifier import classify_symptom
-from app.timeline_parser import extract_week
-from app.timeline_checker import check_symptoms_by_week
-from app.triage_engine import run_triage_questions
-from app.combo_checker import infer_symptom_combinations
+from app.query_analysis import analyze_query, print_risk_summary
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime: app.agents pulls in LangChain, FAISS and torch
+    from .agents import PregnancyHealthAgent
 
 logger = logging.getLogger(__name__)
 
+WARMING_UP_ANSWER = (
+    "⏳ The AI assistant is still starting up, so this response only contains the clinical rule "
+    "assessment for your question. Please ask again in a few seconds for a full answer."
+)
+
+def question_key(question: str) -> str:
+    """Single-flight key: questions differing only in case or whitespace share an answer"""
+    return " ".join(question.lower().split())
+
 class PregnancyAIService:
     """Service layer for Pregnancy AI operations"""
     
     def __init__(self):
-        self.agent: Optional[PregnancyHealthAgent] = None
+        self.agent: Optional["PregnancyHealthAgent"] = None
         self.is_initialized = False
         self.initialization_error = None
+        self.warmup_task: Optional[asyncio.Task] = None
+        # The agent is synchronous (embedding + Groq calls), so it runs on
+        # dedicated worker threads to keep the event loop responsive
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.max_inflight_requests),
+            thread_name_prefix="agent"
+        )
+        self.limiter = InflightLimiter(
+            max_inflight=settings.max_inflight_requests,
+            max_queued=settings.max_queued_requests,
+            retry_after=settings.overload_retry_after
+        )
+        # Identical questions arriving together share one agent run (and one Groq call)
+        self.single_flight = SingleFlight()
         
+    @property
+    def is_warming(self) -> bool:
+        """True while the background warm-up is still loading the model and index"""
+        return self.warmup_task is not None and not self.warmup_task.done()
+
+    def start_warmup(self) -> asyncio.Task:
+        """Start initializing in the background (once) so the server accepts connections right away"""
+        if self.warmup_task is None:
+            self.warmup_task = asyncio.get_running_loop().create_task(self.initialize())
+        return self.warmup_task
+
     async def initialize(self) -> bool:
         """Initialize the AI service"""
         try:
             logger.info("🚀 Initializing Pregnancy AI Service...")
-            self.agent = PregnancyHealthAgent()
-            
-            # Initialize the system
-            success = self.agent.initialize_system()
-            if success:
+            # Importing the agent stack and loading MiniLM and the index take seconds;
+            # keep the event loop serving meanwhile
+            agent = await asyncio.to_thread(self._load_agent)
+            if agent is not None:
+                self.agent = agent
                 self.is_initialized = True
-                logger.info("✅ Pregnancy AI Service initialized successfully")
+                ready_after = startup.record("ready")
+                if ready_after is not None:
+                    logger.info(f"✅ Pregnancy AI Service ready {ready_after:.2f}s after process start")
+                else:
+                    logger.info("✅ Pregnancy AI Service initialized successfully")
                 return True
             else:
                 self.initialization_error = "Failed to initialize AI system"
@@ -45,6 +87,16 @@ class PregnancyAIService:
             logger.error(f"❌ Error initializing service: {e}")
             return False
         
+    @staticmethod
+    def _load_agent() -> Optional["PregnancyHealthAgent"]:
+        """Import and initialize the agent; None if the system failed to initialize"""
+        start = time.time()
+        from .agents import PregnancyHealthAgent
+        logger.info(f"📦 Agent stack imported in {time.time() - start:.2f}s")
+
+        agent = PregnancyHealthAgent()
+        return agent if agent.initialize_system() else None
+
     def get_risk_icon(self, risk: str) -> str:
         risk = risk.lower()
         if risk == "high":
@@ -61,25 +113,37 @@ class PregnancyAIService:
         start_time = time.time()
         
         try:
-            if not self.is_initialized or not self.agent:
+            if not self.is_initialized and not self.is_warming:
                 raise Exception("AI service not initialized")
             
             # Log the question
             logger.info(f"Question: {question}")
 
-            # extract week if applicable
-            week = extract_week(question)
-            timeline_results = check_symptoms_by_week(week, question) if week else []
+            # Rule-engine analysis, computed once and shared with the agent
+            analysis = analyze_query(question)
 
-                # symptom classification
-            classifications = classify_symptom(question)
-            combination_results = infer_symptom_combinations(question)
+            # The rule engines need no model, so they answer while the agent warms up
+            if not self.is_initialized:
+                print_risk_summary(analysis)
+                return self._rules_only_response(analysis, time.time() - start_time)
             
-            # Process the question
-            answer = self.agent.process_question(question)
+            # Concurrent duplicates await the first caller's agent run instead of starting their own
+            answer, shared = await self.single_flight.run(
+                question_key(question), lambda: self._run_agent(question, analysis)
+            )
+            if shared:
+                logger.info("🔗 Joined an in-flight agent run for the same question")
             
-            # Extract sources for terminal logging only
-            sources = await self._extract_sources(question)
+            # Sources come from the same retrieval the agent used to answer
+            sources = list(answer.get("sources", []))
+            if answer.get("cache_hit"):
+                logger.info("🎯 Answer served from the semantic answer cache")
+            retrieval_counts = answer.get("retrieval_stats")
+            if retrieval_counts and not shared:
+                logger.info(
+                    f"🔍 Retrieval: {retrieval_counts['embeddings']} embedding(s), "
+                    f"{retrieval_counts['searches']} search(es)"
+                )
             
             # Log sources to terminal
             if sources:
@@ -91,35 +155,18 @@ class PregnancyAIService:
             processing_time = time.time() - start_time
 
             # Show classification results
-            if classifications:
-                print("\n⚠️ Symptom Risk Summary:")
-                for c in classifications:
-                    print(f"- '{c['matched_phrase']}' → Risk: {c['risk']}, Condition: {c['condition']}")
-                    print(f"  Suggested Action: {c['action']}")
-
-            if week and timeline_results:
-                print("\n📅 Timeline-Aware Risk(s):")
-                for res in timeline_results:
-                    print(f"- Week {week}: '{res['symptom']}' → {res['condition']} ({res['risk']})")
-                    print(f"  Action: {res['action']}")
-
-            if combination_results:
-                print("\n🧩 Inferred Risk Combination(s):")
-                for res in combination_results:
-                    print(f"- Symptoms: {', '.join(res['matched_symptoms'])} → {res['condition']} ({res['risk']})")
-                    print(f"  Urgent Action: {res['action']}")
-            else:
-                print("\n✅ No high-risk symptom combinations detected.")
+            print_risk_summary(analysis)
             
             # Create response (without sources)
             response = QuestionResponse(
                 answer=answer['message'],  # Use 'message' key from response
-                symptom_combinations=classifications,
-                timeline_conditions=timeline_results,
-                combination_inferences=combination_results,
-                classifications=classifications,
-                timeline_results=timeline_results,
-                combination_results=combination_results,
+                symptom_combinations=list(analysis.classifications),
+                timeline_conditions=list(analysis.timeline_results),
+                combination_inferences=list(analysis.combinations),
+                classifications=list(analysis.classifications),
+                timeline_results=list(analysis.timeline_results),
+                combination_results=list(analysis.combinations),
+                partial_combinations=list(analysis.partial_combinations),
                 sources=sources,
                 confidence_score=0.9,  # Default confidence score
                 processing_time=processing_time,
@@ -129,6 +176,8 @@ class PregnancyAIService:
             logger.info(f"✅ Question processed successfully in {processing_time:.2f}s")
             return response
             
+        except ServiceOverloadedError:
+            raise
         except Exception as e:
             processing_time = time.time() - start_time
             logger.error(f"❌ Error processing question: {e}")
@@ -141,28 +190,117 @@ class PregnancyAIService:
                 processing_time=processing_time,
                 timestamp=datetime.now()
             )
-    
-    async def _extract_sources(self, query: str) -> List[str]:
-        """Extract sources from the last search operation for terminal logging"""
-        sources = []
+
+    async def _run_agent(self, question: str, analysis) -> dict:
+        """Process the question off the event loop, queueing for a free slot"""
+        async with self.limiter.slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self.agent.process_question, question, analysis
+            )
+
+    @staticmethod
+    def _rules_only_response(analysis, processing_time: float) -> QuestionResponse:
+        """Response carrying only the rule-engine assessment, served while the agent warms up"""
+        logger.info(f"⏳ Served a rule-engine-only response while warming up ({processing_time * 1000:.1f}ms)")
+        return QuestionResponse(
+            answer=WARMING_UP_ANSWER,
+            symptom_combinations=list(analysis.classifications),
+            timeline_conditions=list(analysis.timeline_results),
+            combination_inferences=list(analysis.combinations),
+            classifications=list(analysis.classifications),
+            timeline_results=list(analysis.timeline_results),
+            combination_results=list(analysis.combinations),
+            partial_combinations=list(analysis.partial_combinations),
+            sources=[],
+            confidence_score=0.0,
+            rules_only=True,
+            processing_time=processing_time,
+            timestamp=datetime.now()
+        )
+
+    async def stream_question(self, question: str) -> AsyncIterator[str]:
+        """Stream a pregnancy health answer as Server-Sent Events.
+
+        The rule-engine risk assessment is sent first, then answer tokens as
+        the LLM produces them, and finally the sources and timing.
+        """
+        start_time = time.time()
         
         try:
-            if not self.agent or not self.agent.retriever:
-                return sources
-            
-            # Get documents from retriever
-            docs = self.agent.retriever.invoke(query)
+            if not self.is_initialized and not self.is_warming:
+                raise Exception("AI service not initialized")
             
-            for i, doc in enumerate(docs[:3], 1):
-                source = doc.metadata.get('source', 'Unknown source')
-                filename = source.split('/')[-1] if '/' in source else source
-                filename = filename.split('\\')[-1] if '\\' in filename else filename
-                sources.append(filename)
-                
+            logger.info(f"Question (stream): {question}")
+
+            # Rule engines are cheap, so the risk table goes out before any LLM work
+            analysis = analyze_query(question)
+
+            yield self._sse_event("risk", {
+                "week": analysis.week,
+                "gestational_age": str(analysis.gestational_age) if analysis.gestational_age else None,
+                "trimester": analysis.trimester,
+                "classifications": analysis.classifications,
+                "timeline_results": analysis.timeline_results,
+                "combination_results": analysis.combinations,
+                "partial_combinations": analysis.partial_combinations,
+                "risk_table": analysis.risk_table,
+                "rules_version": analysis.rules.version,
+                "elapsed": time.time() - start_time,
+            })
+
+            if not self.is_initialized:
+                yield self._sse_event("done", {
+                    "answer": WARMING_UP_ANSWER,
+                    "sources": [],
+                    "rules_only": True,
+                    "processing_time": time.time() - start_time,
+                    "timestamp": datetime.now().isoformat(),
+                })
+                logger.info("⏳ Streamed a rule-engine-only response while warming up")
+                return
+
+            async with self.limiter.slot():
+                loop = asyncio.get_running_loop()
+                messages, sources = await loop.run_in_executor(
+                    self._executor, self.agent.prepare_streaming_answer, question, analysis
+                )
+
+                tokens = []
+                time_to_first_token = None
+                async for token in self.agent.astream_answer(messages):
+                    if time_to_first_token is None:
+                        time_to_first_token = time.time() - start_time
+                    tokens.append(token)
+                    yield self._sse_event("token", {"text": token})
+
+            processing_time = time.time() - start_time
+            yield self._sse_event("done", {
+                "answer": self.agent.format_response("".join(tokens)),
+                "sources": sources,
+                "time_to_first_token": time_to_first_token,
+                "processing_time": processing_time,
+                "timestamp": datetime.now().isoformat(),
+            })
+            logger.info(f"✅ Question streamed successfully in {processing_time:.2f}s")
+
+        except ServiceOverloadedError as e:
+            yield self._sse_event("error", {"error": str(e), "retry_after": e.retry_after})
         except Exception as e:
-            logger.error(f"Error extracting sources: {e}")
-        
-        return sources
+            logger.error(f"❌ Error streaming question: {e}")
+            yield self._sse_event("error", {
+                "error": f"Sorry, I encountered an error while processing your question: {str(e)}",
+                "processing_time": time.time() - start_time,
+            })
+
+    @staticmethod
+    def _sse_event(event: str, data: Dict[str, Any]) -> str:
+        """Encode a single Server-Sent Event"""
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    def shutdown(self):
+        """Stop the agent worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 # Global service instance
 pregnancy_service = PregnancyAIService() 
\ No newline at end of file
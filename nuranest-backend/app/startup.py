@@ -0,0 +1,53 @@
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+_IMPORTED_AT = time.time()
+
+
+def process_start_time() -> float:
+    """
+    Wall-clock time the process started (Linux /proc), so cold-start numbers
+    include interpreter start-up and imports. Falls back to when this module
+    was imported.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime (field 22) in clock ticks since boot; fields after "comm)" start at field 3
+            started_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - (uptime - started_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return _IMPORTED_AT
+
+
+class StartupMilestones:
+    """Seconds from process start to one-off events such as the first connection or readiness"""
+
+    def __init__(self):
+        self.started_at = process_start_time()
+        self._lock = threading.Lock()
+        self._milestones: Dict[str, float] = {}
+
+    def record(self, name: str) -> Optional[float]:
+        """Record ``name`` the first time it happens; returns its offset then, None on repeats"""
+        if name in self._milestones:
+            return None
+        with self._lock:
+            if name in self._milestones:
+                return None
+            elapsed = time.time() - self.started_at
+            self._milestones[name] = elapsed
+            return elapsed
+
+    def get(self, name: str) -> Optional[float]:
+        return self._milestones.get(name)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {f"{name}_seconds": round(elapsed, 3) for name, elapsed in self._milestones.items()}
+
+
+startup = StartupMilestones()
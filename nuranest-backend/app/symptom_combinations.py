@@ -1,146 +0,0 @@
-SYMPTOM_COMBINATIONS = [
-    {
-        "symptoms": ["headache", "blurry vision", "swelling"],
-        "condition": "Classic triad of preeclampsia",
-        "risk": "High",
-        "action": "Immediate medical evaluation for blood pressure and protein in urine"
-    },
-    {
-        "symptoms": ["bleeding", "sharp abdominal pain", "low blood pressure"],
-        "condition": "Ectopic Pregnancy",
-        "risk": "High",
-        "action": "Emergency evaluation for internal bleeding"
-    },
-    {
-        "symptoms": ["fever", "vaginal discharge", "abdominal tenderness"],
-        "condition": "Chorioamnionitis (Infection)",
-        "risk": "High",
-        "action": "Immediate hospital admission and IV antibiotics"
-    },
-    {
-        "symptoms": ["no fetal movement", "third trimester"],
-        "condition": "Possible Stillbirth or Fetal Distress",
-        "risk": "High",
-        "action": "Emergency ultrasound scan"
-    },
-    {
-        "symptoms": ["contractions", "pelvic pressure", "watery discharge"],
-        "condition": "Preterm Labor",
-        "risk": "Medium–High",
-        "action": "Hospital evaluation if < 37 weeks"
-    },
-    {
-        "symptoms": ["persistent vomiting", "dehydration", "weight loss"],
-        "condition": "Hyperemesis Gravidarum",
-        "risk": "Medium",
-        "action": "Consult OB for possible IV fluids and antiemetics"
-    },
-    {
-        "symptoms": ["mild nausea", "fatigue", "breast tenderness"],
-        "condition": "Normal 1st trimester symptoms",
-        "risk": "Low",
-        "action": "Self-monitor, routine prenatal follow-up"
-    },
-    {
-        "symptoms": ["light spotting", "mild cramping"],
-        "condition": "Implantation bleeding or normal early pregnancy symptom",
-        "risk": "Low",
-        "action": "Self-monitor, contact OB if worsens"
-    },
-    {
-        "symptoms": ["mild back pain", "round ligament pain"],
-        "condition": "Normal ligament stretching",
-        "risk": "Low",
-        "action": "Self-monitor, rest as needed"
-    },
-    {
-        "symptoms": ["elevated blood pressure", "swelling", "headache"],
-        "condition": "Possible preeclampsia",
-        "risk": "Medium",
-        "action": "Consult doctor within 24h"
-    },
-    {
-        "symptoms": ["thirst", "frequent urination", "fatigue"],
-        "condition": "Possible gestational diabetes",
-        "risk": "Medium",
-        "action": "Ask for glucose test"
-    },
-    {
-        "symptoms": ["heavy bleeding", "severe abdominal pain"],
-        "condition": "Possible miscarriage or placental abruption",
-        "risk": "High",
-        "action": "Immediate OB or ER visit"
-    },
-    {
-        "symptoms": ["shoulder tip pain", "dizziness", "nausea"],
-        "condition": "Possible ectopic pregnancy with bleeding",
-        "risk": "High",
-        "action": "Emergency care"
-    },
-    {
-        "symptoms": ["persistent fever", "chills", "abdominal pain"],
-        "condition": "Possible intrauterine infection",
-        "risk": "High",
-        "action": "Visit ER for evaluation"
-    },
-    {
-        "symptoms": ["severe abdominal pain", "shoulder pain", "dizziness", "heavy bleeding"],
-        "condition": "Ectopic Pregnancy",
-        "risk": "High",
-        "action": "Emergency OB-GYN evaluation"
-    },
-    {
-        "symptoms": ["blurry vision", "headache", "swelling", "high blood pressure"],
-        "condition": "Preeclampsia",
-        "risk": "High",
-        "action": "Urgent prenatal evaluation"
-    },
-    {
-        "symptoms": ["no fetal movement", "reduced fetal movement"],
-        "condition": "Stillbirth or Fetal Distress",
-        "risk": "High",
-        "action": "Immediate fetal heart check"
-    },
-    {
-        "symptoms": ["spotting", "fatigue", "severe cramping"],
-        "condition": "Possible Miscarriage",
-        "risk": "Medium–High",
-        "action": "Ultrasound recommended"
-    },
-    {
-        "symptoms": ["contractions", "pelvic pressure", "watery discharge"],
-        "condition": "Preterm Labor",
-        "risk": "Medium–High",
-        "action": "Hospital evaluation if < 37 weeks"
-    },
-    {
-        "symptoms": ["persistent vomiting", "dehydration", "weight loss"],
-        "condition": "Hyperemesis Gravidarum",
-        "risk": "Medium",
-        "action": "Consult OB for possible IV fluids and antiemetics"
-    },
-    {
-        "symptoms": ["mild nausea", "fatigue", "breast tenderness"],
-        "condition": "Normal 1st trimester symptoms",
-        "risk": "Low",
-        "action": "Self-monitor, routine prenatal follow-up"
-    },
-    {
-        "symptoms": ["light spotting", "mild cramping"],
-        "condition": "Implantation bleeding or normal early pregnancy symptom",
-        "risk": "Low",
-        "action": "Self-monitor, contact OB if worsens"
-    },
-    {
-        "symptoms": ["mild back pain", "round ligament pain"],
-        "condition": "Normal ligament stretching",
-        "risk": "Low",
-        "action": "Self-monitor, rest as needed"
-    },
-    {
-        "symptoms" : ["Heavy Vaginal Bleeding, Cramping"],
-        "condition": "Miscarriage or placental abruption.",
-        "risk": "High",
-        "action": "Emergency OB-GYN evaluation"
-    }
-]
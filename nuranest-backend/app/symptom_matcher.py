@@ -0,0 +1,10 @@
+from typing import Optional
+
+from app.rule_index import SymptomMatches
+from app.rule_store import CompiledRules, rule_store
+
+
+def match_symptoms(user_input: str, rules: Optional[CompiledRules] = None) -> SymptomMatches:
+    """Find every rule-table phrase in the input with a single pass"""
+    rules = rules or rule_store.current()
+    return rules.matcher.find_all(user_input.lower())
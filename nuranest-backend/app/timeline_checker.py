@@ -1,19 +1,54 @@
-from app.symptom_timeline_rules import TIMELINE_RULES
+from typing import Optional
 
-def check_symptoms_by_week(week: int, user_input: str) -> list:
-    user_input = user_input.lower()
+from app.rule_store import CompiledRules, rule_store
+from app.symptom_matcher import SymptomMatches, match_symptoms
+from app.timeline_parser import GestationalAge
+
+def check_symptoms_by_week(week: int, user_input: str, matches: Optional[SymptomMatches] = None,
+                           days: int = 0, rules: Optional[CompiledRules] = None) -> list:
+    rules = rules or rule_store.current()
+    if matches is None:
+        matches = match_symptoms(user_input, rules)
     matched_conditions = []
 
-    for rule in TIMELINE_RULES:
-        if rule["min_week"] <= week <= rule["max_week"]:
-            for symptom in rule["symptoms"]:
-                if symptom in user_input:
-                    matched_conditions.append({
-                        "symptom": symptom,
-                        "condition": rule["condition"],
-                        "risk": rule["risk"],
-                        "action": rule["action"],
-                        "week": week
-                    })
+    timeline_index = rules.timeline_index
+    for index, position in timeline_index.lookup(timeline_index.for_week(week, days), matches):
+        rule = timeline_index.rules[index]
+        matched_conditions.append({
+            "symptom": rule["symptoms"][position],
+            "condition": rule["condition"],
+            "risk": rule["risk"],
+            "action": rule["action"],
+            "week": week
+        })
 
     return matched_conditions
+
+def check_symptoms_by_trimester(trimester: int, user_input: str, matches: Optional[SymptomMatches] = None,
+                                rules: Optional[CompiledRules] = None) -> list:
+    rules = rules or rule_store.current()
+    if matches is None:
+        matches = match_symptoms(user_input, rules)
+    matched_conditions = []
+
+    timeline_index = rules.timeline_index
+    for index, position in timeline_index.lookup(timeline_index.for_trimester(trimester), matches):
+        rule = timeline_index.rules[index]
+        matched_conditions.append({
+            "symptom": rule["symptoms"][position],
+            "condition": rule["condition"],
+            "risk": rule["risk"],
+            "action": rule["action"],
+            "trimester": trimester
+        })
+
+    return matched_conditions
+
+def check_symptoms_for_age(age: Optional[GestationalAge], trimester: Optional[int], user_input: str,
+                           matches: Optional[SymptomMatches] = None, rules: Optional[CompiledRules] = None) -> list:
+    """Timeline risks for a gestational age, or for a trimester when no week is given"""
+    if age:
+        return check_symptoms_by_week(age.weeks, user_input, matches, days=age.days, rules=rules)
+    if trimester:
+        return check_symptoms_by_trimester(trimester, user_input, matches, rules=rules)
+    return []
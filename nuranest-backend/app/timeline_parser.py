@@ -1,11 +1,53 @@
 import re
+from typing import NamedTuple, Optional
+
+
+class GestationalAge(NamedTuple):
+    weeks: int
+    days: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.weeks}w{self.days}d" if self.days else f"{self.weeks}w"
+
+
+# "20w3d", "20w 3d", "20 weeks 3 days", "20 weeks and 3 days", "6 weeks", and "20+3" only
+# with week context ("20+3 weeks", "20+3 pregnant", "pregnant at 20+3") - a bare "N+D"
+# is as likely a sum, a dose or a reading
+_GESTATIONAL_AGE_PATTERNS = [
+    re.compile(r"\b(\d{1,2})\s*w(?:ks?)?\s*\+?\s*([0-6])\s*d(?:ays?)?\b"),
+    re.compile(r"\b(\d{1,2})\s*\+\s*([0-6])\s*(?:w(?:ks?|eeks?)?|pregnant)\b"),
+    re.compile(r"\b(?:pregnant|gestation)\s*(?:at|of|is|:)?\s*(\d{1,2})\s*\+\s*([0-6])\b"),
+    re.compile(r"\b(\d{1,2})\s*(?:weeks|week)\b(?:\s*(?:and|,|\+)?\s*([0-6])\s*(?:days|day)\b)?"),
+]
+
+_TRIMESTER_PATTERN = re.compile(r"\b(first|1st|second|2nd|third|3rd)\s+trimester\b")
+_TRIMESTER_NUMBERS = {"first": 1, "1st": 1, "second": 2, "2nd": 2, "third": 3, "3rd": 3}
+
+
+def extract_gestational_age(input_text: str) -> Optional[GestationalAge]:
+    """
+    Looks for phrases like "I am 6 weeks pregnant", "20 weeks 3 days" or "20w3d"
+    """
+    input_text = input_text.lower()
+    # The first mention in the text wins, whichever pattern finds it
+    matches = [m for m in (pattern.search(input_text) for pattern in _GESTATIONAL_AGE_PATTERNS) if m]
+    if not matches:
+        return None
+    match = min(matches, key=lambda m: m.start())
+    return GestationalAge(int(match.group(1)), int(match.group(2) or 0))
+
 
 def extract_week(input_text: str) -> int | None:
     """
     Looks for phrases like "I am 6 weeks pregnant" or "currently 20 weeks"
     """
-    input_text = input_text.lower()
-    match = re.search(r"(\d{1,2})\s*(weeks|week)\b", input_text)
-    if match:
-        return int(match.group(1))
-    return None
+    age = extract_gestational_age(input_text)
+    return age.weeks if age else None
+
+
+def extract_trimester(input_text: str) -> int | None:
+    """
+    Looks for phrases like "second trimester" or "3rd trimester"
+    """
+    match = _TRIMESTER_PATTERN.search(input_text.lower())
+    return _TRIMESTER_NUMBERS[match.group(1)] if match else None
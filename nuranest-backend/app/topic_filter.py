@@ -0,0 +1,61 @@
+import re
+from typing import Optional
+
+from app.query_analysis import QueryAnalysis, analyze_query
+
+OFF_TOPIC_RESPONSE = (
+    "I'm a pregnancy health assistant. I can help you with questions about pregnancy, "
+    "prenatal care, maternal health, and related topics. What would you like to know about pregnancy health?"
+)
+
+# Word stems that mark a question as pregnancy / maternal health related
+PREGNANCY_TERMS = [
+    "pregnan", "prenatal", "antenatal", "postnatal", "postpartum", "perinatal", "trimester",
+    "gestation", "fetal", "fetus", "foetus", "embryo", "baby", "babies", "unborn", "newborn",
+    "deliver", "contraction", "midwife", "obstetric", "ob-gyn", "obgyn",
+    "gynecolog", "gynaecolog", "miscarr", "stillbirth", "ectopic", "preeclampsia", "pre-eclampsia",
+    "eclampsia", "hyperemesis", "placenta", "umbilical", "amniotic", "cervix", "cervical",
+    "uterus", "uterine", "womb", "c-section", "cesarean", "caesarean", "epidural", "ultrasound",
+    "conceive", "conception", "ovulat", "fertility", "breastfeed", "breast feed", "lactat",
+    "morning sickness", "nausea", "folic", "prenatal vitamin", "due date", "expecting",
+    "maternal", "spotting", "bleeding", "cramp", "weeks along",
+]
+
+# Whole words only: as stems they would also match "moment", "mumble", "birthday", "laboratory"...
+PREGNANCY_WORDS = ["mom", "mum", "mother", "birth", "labor", "labour", "kick", "ivf", "nursing"]
+
+# Topics that are clearly not health questions; only these are refused without the LLM
+OFF_TOPIC_TERMS = [
+    "python", "javascript", "java", "sql", "html", "css", "programming", "source code", "compile",
+    "debug", "algorithm", "stock market", "stocks", "bitcoin", "crypto", "cryptocurrency", "mortgage",
+    "capital of", "president of", "prime minister", "world cup", "football score", "who won",
+    "weather forecast", "lyrics", "movie", "write a poem", "write an essay", "translate",
+]
+
+_TERMS_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in PREGNANCY_TERMS) + r")"
+    r"|\b(?:" + "|".join(re.escape(word) for word in PREGNANCY_WORDS) + r")(?:s|es|ed|ing)?\b"
+)
+_OFF_TOPIC_PATTERN = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in OFF_TOPIC_TERMS) + r")s?\b")
+
+
+def is_pregnancy_related(question: str, analysis: Optional[QueryAnalysis] = None) -> bool:
+    """
+    Cheap keyword check used to refuse off-topic questions without an LLM call.
+
+    Only a confident negative is refused: the question names a clearly
+    unrelated topic (code, finance, sport, trivia) and has no pregnancy term,
+    gestational week or symptom phrase known to the rule engines. Anything
+    else - including on-topic questions with none of the keywords, like
+    "Can I eat sushi?" - goes to the LLM, whose prompt already redirects
+    off-topic questions.
+    """
+    if analysis is None:
+        analysis = analyze_query(question)
+    if _TERMS_PATTERN.search(analysis.lowered):
+        return True
+    if analysis.gestational_age is not None or analysis.trimester is not None:
+        return True
+    if analysis.matches:
+        return True
+    return not _OFF_TOPIC_PATTERN.search(analysis.lowered)
@@ -1,10 +1,10 @@
-from app.triage_questions import TRIAGE_QUESTIONS
+from app.rule_store import rule_store
 
 def run_triage_questions(existing_input: str) -> dict:
     user_data = {"original_input": existing_input}
     remaining = []
 
-    for q in TRIAGE_QUESTIONS:
+    for q in rule_store.current().triage_questions:
         if q["key"] not in existing_input.lower():
             remaining.append(q)
 
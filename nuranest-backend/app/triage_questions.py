@@ -1,26 +0,0 @@
-TRIAGE_QUESTIONS = [
-    {
-        "key": "bleeding",
-        "question": "Are you currently experiencing any unusual bleeding or discharge?"
-    },
-    {
-        "key": "fetal_movement",
-        "question": "How would you describe your baby’s movements today compared to yesterday?"
-    },
-    {
-        "key": "headache_vision",
-        "question": "Have you had any headaches that won’t go away or that affect your vision?"
-    },
-    {
-        "key": "pelvic_pain",
-        "question": "Do you feel any pressure or pain in your pelvis or lower back?"
-    },
-    {
-        "key": "fever_discharge",
-        "question": "Have you had a fever or noticed any foul-smelling discharge?"
-    },
-    {
-        "key": "gestational_week",
-        "question": "How far along are you in your pregnancy? (in weeks)"
-    }
-]
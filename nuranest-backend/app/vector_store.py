@@ -0,0 +1,221 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, Tuple, Union
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.docstore.base import Docstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from app.faiss_index import RescoringIndex, vector_storage_of
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.faiss"
+DOCSTORE_FILENAME = "docstore.sqlite3"
+# Exact float32 vectors of a compressed index, for re-scoring (optional at load time)
+EXACT_VECTORS_FILENAME = "vectors.npy"
+LEGACY_DOCSTORE_FILENAME = "index.pkl"
+SPARSE_TABLE = "chunks_fts"
+
+
+class ReadOnlyConnections:
+    """One read-only SQLite connection per thread (connections can't be shared across threads)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            # Read pages through mmap so every worker process shares the OS page cache
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
+
+class SqliteDocstore(Docstore):
+    """
+    Read-only chunk store backed by an indexed SQLite file.
+
+    Unlike the pickled InMemoryDocstore nothing is loaded up front: the text
+    and metadata of a chunk are read only when a search returns it. It is
+    not an AddableMixin, so FAISS refuses to add to it; ingestion loads a
+    writable InMemoryDocstore instead (``load_vectorstore(writable=True)``).
+    """
+
+    def __init__(self, path: str, connections: ReadOnlyConnections = None):
+        self.path = path
+        self._connections = connections or ReadOnlyConnections(path)
+
+    def search(self, search: str) -> Union[str, Document]:
+        row = self._connections.get().execute(
+            "SELECT page_content, metadata FROM chunks WHERE id = ?", (search,)
+        ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+
+    def __len__(self) -> int:
+        return self._connections.get().execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+
+class SqlitePositionMap(Mapping):
+    """FAISS row -> docstore ID, looked up in the same SQLite file instead of held in memory"""
+
+    def __init__(self, connections: ReadOnlyConnections):
+        self._connections = connections
+
+    def __getitem__(self, position) -> str:
+        row = self._connections.get().execute(
+            "SELECT id FROM chunks WHERE position = ?", (int(position),)
+        ).fetchone()
+        if row is None:
+            raise KeyError(position)
+        return row[0]
+
+    def __iter__(self) -> Iterator[int]:
+        for (position,) in self._connections.get().execute("SELECT position FROM chunks ORDER BY position"):
+            yield position
+
+    def __len__(self) -> int:
+        return self._connections.get().execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+
+def write_docstore(path: str, docstore, index_to_docstore_id: Dict[int, str]):
+    """Write every chunk in FAISS row order to a fresh SQLite file, replacing ``path`` atomically"""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(
+            "CREATE TABLE chunks (position INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, "
+            "page_content TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        rows = []
+        for position, doc_id in sorted(index_to_docstore_id.items()):
+            doc = docstore.search(doc_id)
+            rows.append((position, doc_id, doc.page_content, json.dumps(doc.metadata)))
+        conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+        # BM25 keyword index over the same rows, for hybrid retrieval
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {SPARSE_TABLE} USING fts5(page_content, content='chunks', "
+            "content_rowid='position', tokenize='porter unicode61')"
+        )
+        conn.execute(f"INSERT INTO {SPARSE_TABLE}({SPARSE_TABLE}) VALUES ('rebuild')")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+def read_docstore(path: str) -> Tuple[InMemoryDocstore, Dict[int, str]]:
+    """Load a SQLite docstore fully into memory, for ingestion runs that modify the index"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        docs, index_to_docstore_id = {}, {}
+        for position, doc_id, content, metadata in conn.execute(
+            "SELECT position, id, page_content, metadata FROM chunks ORDER BY position"
+        ):
+            docs[doc_id] = Document(id=doc_id, page_content=content, metadata=json.loads(metadata))
+            index_to_docstore_id[position] = doc_id
+    finally:
+        conn.close()
+    return InMemoryDocstore(docs), index_to_docstore_id
+
+
+def save_vectorstore(vectorstore: FAISS, folder: str):
+    """
+    Save the FAISS index and a SQLite docstore (no pickle).
+
+    A compressed index with exact re-scoring is split: index.faiss holds
+    only the compressed index and vectors.npy the exact float32 vectors.
+    """
+    os.makedirs(folder, exist_ok=True)
+    index = vectorstore.index
+    vectors_path = os.path.join(folder, EXACT_VECTORS_FILENAME)
+    tmp_index = os.path.join(folder, f"{INDEX_FILENAME}.tmp")
+    if isinstance(index, RescoringIndex):
+        tmp_vectors = os.path.join(folder, f"{EXACT_VECTORS_FILENAME}.tmp")
+        with open(tmp_vectors, "wb") as f:
+            np.save(f, np.asarray(index.vectors, dtype=np.float32))
+        index = index.index
+    faiss.write_index(index, tmp_index)
+    write_docstore(os.path.join(folder, DOCSTORE_FILENAME), vectorstore.docstore, vectorstore.index_to_docstore_id)
+    os.replace(tmp_index, os.path.join(folder, INDEX_FILENAME))
+    if isinstance(vectorstore.index, RescoringIndex):
+        os.replace(tmp_vectors, vectors_path)
+    elif os.path.exists(vectors_path):
+        os.remove(vectors_path)  # Left by an earlier compressed index
+
+    # A pickle left by an older ingestion would no longer match the index
+    legacy = os.path.join(folder, LEGACY_DOCSTORE_FILENAME)
+    if os.path.exists(legacy):
+        os.remove(legacy)
+
+
+def read_index(path: str, mmap: bool = True) -> faiss.Index:
+    """
+    Read a FAISS index, memory-mapping its vectors when ``mmap`` is set.
+
+    Mapped indexes are read-only and backed by the OS page cache, so several
+    worker processes serving the same file share one copy.
+    """
+    if not mmap:
+        return faiss.read_index(path)
+    # IVF inverted lists and flat codes (also HNSW storage) use different mmap flags;
+    # IVF index files start with an "Iw.." fourcc
+    with open(path, "rb") as f:
+        is_ivf = f.read(2) == b"Iw"
+    flag = faiss.IO_FLAG_MMAP if is_ivf else faiss.IO_FLAG_MMAP_IFC
+    return faiss.read_index(path, flag | faiss.IO_FLAG_READ_ONLY)
+
+
+def attach_exact_vectors(index, folder: str):
+    """Wrap a compressed index for exact re-scoring when its vectors.npy is present (memory-mapped)"""
+    if vector_storage_of(index) == "float32":
+        return index
+    path = os.path.join(folder, EXACT_VECTORS_FILENAME)
+    if not os.path.exists(path):
+        logger.info(f"ℹ️ No {EXACT_VECTORS_FILENAME} in {folder} - scores come from the {vector_storage_of(index)} vectors")
+        return index
+    return RescoringIndex(index, np.load(path, mmap_mode="r"))
+
+
+def load_vectorstore(folder: str, embeddings, mmap: bool = True, writable: bool = False) -> FAISS:
+    """
+    Load a vectorstore saved by save_vectorstore.
+
+    By default the index is memory-mapped and chunk text is read lazily from
+    SQLite. ``writable=True`` loads everything into memory so the index can be
+    updated (used by ingestion). Indexes saved with a pickled docstore by older
+    versions are still loaded, with a warning.
+    """
+    index_path = os.path.join(folder, INDEX_FILENAME)
+    docstore_path = os.path.join(folder, DOCSTORE_FILENAME)
+
+    if not os.path.exists(docstore_path):
+        logger.warning(f"⚠️ {folder} uses a pickled docstore - re-run ingest_local.py --rebuild to convert it")
+        return FAISS.load_local(folder, embeddings, allow_dangerous_deserialization=True)
+
+    if writable:
+        docstore, index_to_docstore_id = read_docstore(docstore_path)
+        index = attach_exact_vectors(faiss.read_index(index_path), folder)
+        return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+    connections = ReadOnlyConnections(docstore_path)
+    return FAISS(
+        embeddings,
+        attach_exact_vectors(read_index(index_path, mmap=mmap), folder),
+        SqliteDocstore(docstore_path, connections),
+        SqlitePositionMap(connections),
+    )
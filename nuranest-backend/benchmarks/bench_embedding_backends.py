@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Embedding backends: query throughput, ingest throughput and agreement with torch.
+
+Loads settings.embedding_model (or --model) on each backend from
+app.embedding_backends and measures:
+
+- queries/s: one embed_query call at a time, like a request does
+- chunks/s:  embed_documents over --batch-size chunks of ~1000 characters,
+             like ingest_local.py does
+- cosine vs torch (min / mean) over the benchmark chunks, and whether the
+  backend would pass the EMBEDDING_AGREEMENT_THRESHOLD check
+
+Backends whose dependencies are missing (sentence-transformers, optimum,
+onnxruntime) are reported and skipped.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_embedding_backends
+    python -m benchmarks.bench_embedding_backends --backends torch onnx-int8 --chunks 1024
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.embedding_backends import EMBEDDING_BACKENDS, load_backend
+from benchmarks.common import print_table, summarize_latencies
+
+QUESTIONS = [
+    "What foods should I avoid during pregnancy?",
+    "Is it safe to exercise during the second trimester?",
+    "I am 22 weeks pregnant and have a headache and swelling",
+    "How much folic acid should I take before conception?",
+    "What are the signs of preterm labor?",
+    "Can gestational diabetes harm the baby?",
+]
+
+SENTENCES = [
+    "Pregnant women should avoid raw fish, unpasteurized dairy and high-mercury fish.",
+    "Moderate exercise such as walking and swimming is safe for most pregnancies.",
+    "Headache, blurry vision and swelling after 20 weeks can indicate preeclampsia.",
+    "Take 400 micrograms of folic acid daily before conception and in early pregnancy.",
+    "Regular contractions, pelvic pressure and watery discharge may signal preterm labor.",
+    "Gestational diabetes is usually screened for between 24 and 28 weeks of pregnancy.",
+    "Iron deficiency anaemia is common in pregnancy and can cause tiredness and breathlessness.",
+    "Contact your midwife if the baby's movements slow down or change pattern.",
+]
+
+
+def synthetic_chunks(count: int, rng: random.Random):
+    """~1000-character chunks, the size ingest_local.py splits PDFs into"""
+    chunks = []
+    for _ in range(count):
+        text = ""
+        while len(text) < 1000:
+            text += rng.choice(SENTENCES) + " "
+        chunks.append(text[:1000])
+    return chunks
+
+
+def queries_per_second(embeddings, seconds: float):
+    latencies, i = [], 0
+    stop_at = time.perf_counter() + seconds
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        embeddings.embed_query(f"{QUESTIONS[i % len(QUESTIONS)]} ({i})")
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    return len(latencies) / sum(latencies), summarize_latencies(latencies)
+
+
+def chunks_per_second(embeddings, chunks, batch_size: int):
+    vectors = []
+    start = time.perf_counter()
+    for offset in range(0, len(chunks), batch_size):
+        vectors.extend(embeddings.embed_documents(chunks[offset:offset + batch_size]))
+    return len(chunks) / (time.perf_counter() - start), np.asarray(vectors, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument("--backends", nargs="+", choices=EMBEDDING_BACKENDS, default=list(EMBEDDING_BACKENDS))
+    parser.add_argument("--seconds", type=float, default=5.0, help="Query loop duration per backend")
+    parser.add_argument("--chunks", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    args = parser.parse_args()
+
+    chunks = synthetic_chunks(args.chunks, random.Random(7))
+    threshold = settings.embedding_agreement_threshold
+    print(f"🧮 {args.model}: {args.chunks} chunks, batches of {args.batch_size}, {args.seconds:g}s of queries per backend")
+
+    backends = sorted(args.backends, key=lambda b: b != "torch")  # torch first, as the reference
+    reference = None
+    rows = []
+    for backend in backends:
+        try:
+            start = time.perf_counter()
+            embeddings = load_backend(args.model, backend)
+            load_seconds = time.perf_counter() - start
+        except Exception as e:
+            print(f"⚠️ Skipping {backend}: {e}")
+            continue
+
+        embeddings.embed_documents(chunks[:8])  # Warm-up
+        qps, stats = queries_per_second(embeddings, args.seconds)
+        cps, vectors = chunks_per_second(embeddings, chunks, args.batch_size)
+
+        if backend == "torch":
+            reference = vectors
+        if reference is not None:
+            cosines = (vectors * reference).sum(axis=1) / (
+                np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference, axis=1)
+            )
+            agreement = f"{cosines.min():.4f} / {cosines.mean():.4f}"
+            passes = "yes" if cosines.min() >= threshold else "NO"
+        else:
+            agreement, passes = "n/a (no torch)", "-"
+
+        rows.append([
+            backend, f"{load_seconds:.1f}", f"{qps:.0f}", f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}",
+            f"{cps:.0f}", agreement, passes,
+        ])
+
+    if not rows:
+        print("❌ No backend could be loaded - install sentence-transformers (and optimum[onnxruntime] for ONNX)")
+        return
+    print(f"\n⚡ Embedding backends (agreement threshold {threshold})\n")
+    print_table(
+        ["backend", "load s", "queries/s", "query p50 ms", "query p95 ms", "chunks/s", "cosine vs torch min/mean", "passes"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Query-embedding micro-batching: throughput vs added latency.
+
+Closed-loop load: --clients threads each embed questions back to back for
+--seconds, first straight through the model (window 0) and then through
+BatchingEmbeddings with each --windows value (ms). Reports queries/s,
+p50/p95 latency per query and the mean batch size the model saw.
+
+The model is MiniLM (--model, needs sentence-transformers) or, by default,
+a numpy stand-in shaped like it: token embedding lookup plus --layers
+384 -> 1536 -> 384 feed-forward blocks over --seq-len tokens. Its per-call
+cost is dominated by small matrix multiplies, so like the real model it
+gets cheaper per query in larger batches.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_embedding_batching --clients 1 8 32 --windows 1 2 5 10
+    python -m benchmarks.bench_embedding_batching --model sentence-transformers/all-MiniLM-L6-v2
+"""
+import argparse
+import threading
+import time
+import zlib
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.embedding_batcher import BatchingEmbeddings
+from benchmarks.common import print_table, summarize_latencies
+
+QUESTIONS = [
+    "What foods should I avoid during pregnancy?",
+    "Is it safe to exercise during the second trimester?",
+    "I am 22 weeks pregnant and have a headache and swelling",
+    "How much folic acid should I take before conception?",
+    "What are the signs of preterm labor?",
+    "Can gestational diabetes harm the baby?",
+    "Is heartburn normal in the third trimester?",
+    "When should I worry about bleeding or spotting?",
+]
+
+
+class ToyEncoder(Embeddings):
+    """Transformer-shaped numpy encoder (no attention) standing in for MiniLM"""
+
+    def __init__(self, dimension: int = 384, layers: int = 6, seq_len: int = 32, vocab: int = 30522):
+        rng = np.random.default_rng(0)
+        self.seq_len = seq_len
+        self.vocab = vocab
+        self.token_embeddings = rng.normal(size=(vocab, dimension)).astype(np.float32)
+        self.layers = [
+            (rng.normal(size=(dimension, 4 * dimension)).astype(np.float32) / np.sqrt(dimension),
+             rng.normal(size=(4 * dimension, dimension)).astype(np.float32) / np.sqrt(4 * dimension))
+            for _ in range(layers)
+        ]
+
+    def _tokens(self, text: str) -> np.ndarray:
+        ids = [zlib.crc32(word.encode()) % self.vocab for word in text.lower().split()][:self.seq_len]
+        return np.array(ids + [0] * (self.seq_len - len(ids)))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hidden = self.token_embeddings[np.stack([self._tokens(t) for t in texts])]  # batch x seq x dim
+        for up, down in self.layers:
+            hidden = hidden + np.maximum(hidden @ up, 0) @ down
+            hidden /= np.linalg.norm(hidden, axis=-1, keepdims=True)
+        pooled = hidden.mean(axis=1)
+        return (pooled / np.linalg.norm(pooled, axis=1, keepdims=True)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def load_model(name: str) -> Embeddings:
+    if not name:
+        return ToyEncoder()
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=name, model_kwargs={"device": "cpu"}, encode_kwargs={"normalize_embeddings": True})
+
+
+def run_load(embeddings: Embeddings, clients: int, seconds: float):
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client(offset: int):
+        local, i = [], offset
+        while time.perf_counter() < stop_at:
+            question = f"{QUESTIONS[i % len(QUESTIONS)]} ({i})"
+            start = time.perf_counter()
+            embeddings.embed_query(question)
+            local.append(time.perf_counter() - start)
+            i += clients
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies) / (time.perf_counter() - started), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 32], help="Concurrent callers")
+    parser.add_argument("--windows", type=float, nargs="+", default=[1, 2, 5, 10], help="Batch windows in ms")
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Load duration per configuration")
+    parser.add_argument("--model", default="", help="HuggingFace model name (default: numpy stand-in)")
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    model.embed_documents(QUESTIONS)  # Warm-up
+    print(f"🧮 Model: {args.model or 'numpy MiniLM stand-in'}, {args.seconds:.0f}s per configuration, max batch {args.max_batch}")
+
+    rows = []
+    for clients in args.clients:
+        baseline_qps = None
+        for window in [0.0] + list(args.windows):
+            embeddings = BatchingEmbeddings(model, window_ms=window, max_batch=args.max_batch) if window else model
+            qps, latencies = run_load(embeddings, clients, args.seconds)
+            stats = summarize_latencies(latencies)
+            batch = embeddings.stats()["mean_batch_size"] if window else 1.0
+            if window:
+                embeddings.close()
+            baseline_qps = baseline_qps or qps
+            rows.append([
+                clients, f"{window:g}" if window else "off", f"{qps:.0f}", f"{qps / baseline_qps:.2f}x",
+                f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}", f"{batch:.1f}",
+            ])
+
+    print("\n📦 Query embedding under load: no batching vs micro-batch windows\n")
+    print_table(["clients", "window ms", "queries/s", "vs off", "p50 ms", "p95 ms", "mean batch"], rows)
+
+
+if __name__ == "__main__":
+    main()
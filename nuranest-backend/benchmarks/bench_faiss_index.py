@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+FAISS index types: build time, size, query latency and recall@k vs flat.
+
+Builds every index type supported by app.faiss_index on the same vectors and
+searches it one query at a time (like the API does). Recall@k is the overlap
+of each index's top-k with the exact flat top-k. IVF indexes are swept over
+--nprobe and HNSW over --ef-search.
+
+By default the corpus is synthetic: clustered, L2-normalized 384-dim vectors
+(like MiniLM chunk embeddings), with queries perturbed from corpus vectors.
+Pass --vectorstore to use the vectors of a real index instead.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_faiss_index --vectors 50000 --k 3
+    python -m benchmarks.bench_faiss_index --vectorstore vectorstore_local
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from app.faiss_index import IndexConfig, apply_search_params, build_index, index_type_of, to_flat
+from benchmarks.common import print_table, summarize_latencies
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def synthetic_corpus(count: int, dimension: int, queries: int, rng: np.random.Generator):
+    centers = rng.normal(size=(max(1, count // 100), dimension))
+    vectors = normalize(centers[rng.integers(0, len(centers), count)] + 0.6 * rng.normal(size=(count, dimension)))
+    picks = rng.integers(0, count, queries)
+    query_vectors = normalize(vectors[picks] + 0.3 * rng.normal(size=(queries, dimension)) / np.sqrt(dimension))
+    return vectors, query_vectors
+
+
+def corpus_from_vectorstore(path: str, queries: int, rng: np.random.Generator):
+    flat = to_flat(faiss.read_index(f"{path}/index.faiss"))
+    if flat is None:
+        raise SystemExit(f"❌ {path} keeps no exact vectors (IVF-PQ or compressed without re-scoring)")
+    vectors = flat.reconstruct_n(0, flat.ntotal)
+    picks = rng.integers(0, len(vectors), queries)
+    noise = 0.3 * rng.normal(size=(queries, vectors.shape[1])) / np.sqrt(vectors.shape[1])
+    return vectors, normalize(vectors[picks] + noise)
+
+
+def search_each(index, queries: np.ndarray, k: int):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        results.append(ids[0])
+    return latencies, results
+
+
+def recall(results, truth) -> float:
+    return float(np.mean([len(set(r) & set(t)) / len(t) for r, t in zip(results, truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--types", nargs="+", default=["flat", "ivf_flat", "hnsw", "ivf_pq"])
+    parser.add_argument("--nlist", type=int, default=0)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--vectorstore", help="Benchmark the vectors of an existing index instead")
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(1)  # One query per request, as in the API
+    rng = np.random.default_rng(7)
+    if args.vectorstore:
+        vectors, queries = corpus_from_vectorstore(args.vectorstore, args.queries, rng)
+    else:
+        vectors, queries = synthetic_corpus(args.vectors, args.dimension, args.queries, rng)
+    print(f"📚 {len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}")
+
+    flat = build_index(vectors, IndexConfig("flat"))
+    _, truth = search_each(flat, queries, args.k)
+
+    rows = []
+    for index_type in args.types:
+        config = IndexConfig(index_type, nlist=args.nlist, hnsw_m=args.hnsw_m, pq_m=args.pq_m)
+        start = time.perf_counter()
+        index = build_index(vectors, config)
+        build_seconds = time.perf_counter() - start
+        size_mb = faiss.serialize_index(index).nbytes / (1024 * 1024)
+        built = index_type_of(index)
+
+        if built in ("ivf_flat", "ivf_pq"):
+            sweep = [("nprobe", IndexConfig(built, nprobe=n)) for n in args.nprobe]
+        elif built == "hnsw":
+            sweep = [("efSearch", IndexConfig(built, ef_search=ef)) for ef in args.ef_search]
+        else:
+            sweep = [("-", config)]
+
+        for knob, search_config in sweep:
+            apply_search_params(index, search_config)
+            value = {"nprobe": search_config.nprobe, "efSearch": search_config.ef_search}.get(knob, "")
+            latencies, results = search_each(index, queries, args.k)
+            stats = summarize_latencies(latencies)
+            rows.append([
+                built, f"{knob}={value}" if value else "-", f"{build_seconds:.2f}", f"{size_mb:.1f}",
+                f"{stats['p50_ms']:.3f}", f"{stats['p95_ms']:.3f}", f"{recall(results, truth):.3f}",
+            ])
+
+    print(f"\n🗂️ FAISS index comparison (recall@{args.k} vs flat)\n")
+    print_table(["index", "search param", "build s", "size MB", "p50 ms", "p95 ms", f"recall@{args.k}"], rows)
+
+
+if __name__ == "__main__":
+    main()
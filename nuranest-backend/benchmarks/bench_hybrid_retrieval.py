@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Hybrid (FAISS + BM25, rank-fused) vs dense-only retrieval latency.
+
+Saves a synthetic vectorstore with app.vector_store (memory-mapped index,
+SQLite docstore and FTS5 sparse table, as ingest_local.py does), loads it
+like the API does and times one question at a time:
+
+- dense:             embed + FAISS search
+- hybrid-sequential: embed + FAISS search, then BM25 search
+- hybrid:            HybridRetriever, BM25 runs concurrently with embed + FAISS
+
+Query embedding is simulated with a fixed sleep (--embed-ms, about MiniLM on
+one CPU core) on top of a deterministic fake embedding, so the numbers show
+how much of the sparse search hides behind the embedding model.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_hybrid_retrieval --chunks 20000 --embed-ms 15
+"""
+import argparse
+import random
+import tempfile
+import time
+
+import faiss
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.hybrid_search import HybridRetriever, SparseIndex, reciprocal_rank_fusion
+from app.vector_store import load_vectorstore, save_vectorstore
+from benchmarks.common import print_table, summarize_latencies
+
+VOCABULARY = """
+pregnancy trimester nausea vomiting folic acid iron anemia preeclampsia blood pressure headache swelling
+gestational diabetes glucose insulin ultrasound fetal movement contractions labor preterm cervix placenta
+bleeding spotting cramps miscarriage ectopic hyperemesis heartburn constipation backache fatigue sleep
+exercise walking swimming yoga nutrition calcium vitamin protein caffeine alcohol smoking mercury fish
+listeria toxoplasmosis vaccination influenza pertussis rubella thyroid hypertension proteinuria edema
+""".split()
+
+QUESTIONS = [
+    "What foods should I avoid during pregnancy?",
+    "Is it safe to exercise during the second trimester?",
+    "I am 22 weeks pregnant and have a headache and swelling",
+    "How much folic acid should I take before conception?",
+    "What are the signs of preterm labor?",
+    "Can gestational diabetes harm the baby?",
+    "Is heartburn normal in the third trimester?",
+    "When should I worry about bleeding or spotting?",
+]
+
+
+class SlowEmbeddings(DeterministicFakeEmbedding):
+    """Fake query embeddings that take as long as a small sentence-transformer"""
+
+    delay: float = 0.015
+
+    def embed_query(self, text: str):
+        time.sleep(self.delay)
+        return super().embed_query(text)
+
+
+def synthetic_chunks(count: int, rng: random.Random, filler_words: int = 20000):
+    """Chunks of Zipf-distributed words: medical terms spread among a long tail of filler words"""
+    vocabulary = list(VOCABULARY) + [f"w{i}" for i in range(filler_words)]
+    rng.shuffle(vocabulary)
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+    for i in range(count):
+        words = rng.choices(vocabulary, weights, k=150)
+        yield Document(page_content=" ".join(words), metadata={"source": f"medical_data/doc{i // 40}.pdf", "page": i % 40})
+
+
+def build_store(folder: str, chunks: int, dimension: int) -> None:
+    rng = random.Random(7)
+    docs = list(synthetic_chunks(chunks, rng))
+    embeddings = DeterministicFakeEmbedding(size=dimension)
+    vectorstore = FAISS.from_documents(docs, embeddings)
+    save_vectorstore(vectorstore, folder)
+
+
+def time_each(search, questions, rounds: int):
+    latencies = []
+    for _ in range(rounds):
+        for question in questions:
+            start = time.perf_counter()
+            search(question)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--embed-ms", type=float, default=15.0, help="Simulated query embedding time")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--fetch-k", type=int, default=20, help="Candidates per search before fusion")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(1)  # One query per request, as in the API
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"📚 Building a {args.chunks}-chunk vectorstore...")
+        build_store(folder, args.chunks, args.dimension)
+
+        embeddings = SlowEmbeddings(size=args.dimension, delay=args.embed_ms / 1000)
+        vectorstore = load_vectorstore(folder, embeddings)
+        sparse = SparseIndex.open(folder)
+        hybrid = HybridRetriever(vectorstore, sparse, fetch_k=args.fetch_k)
+
+        def dense(question):
+            return vectorstore.similarity_search_by_vector(embeddings.embed_query(question), k=args.k)
+
+        def sequential(question):
+            dense_docs = vectorstore.similarity_search_by_vector(embeddings.embed_query(question), k=args.fetch_k)
+            sparse_docs = sparse.search(question, args.fetch_k)
+            return reciprocal_rank_fusion([dense_docs, sparse_docs])[:args.k]
+
+        def concurrent(question):
+            return hybrid.search(question, lambda: embeddings.embed_query(question), k=args.k)
+
+        def sparse_only(question):
+            return sparse.search(question, args.fetch_k)
+
+        # Warm the page cache and SQLite connections
+        for search in (dense, sequential, concurrent):
+            time_each(search, QUESTIONS, 1)
+
+        rows = []
+        for name, search in (("bm25 only", sparse_only), ("dense", dense), ("hybrid-sequential", sequential), ("hybrid", concurrent)):
+            stats = summarize_latencies(time_each(search, QUESTIONS, args.rounds))
+            rows.append([name, f"{stats['p50_ms']:.2f}", f"{stats['p95_ms']:.2f}", f"{stats['mean_ms']:.2f}"])
+        hybrid.close()
+
+    print(f"\n🔀 Retrieval latency per question ({args.chunks} chunks, embed {args.embed_ms:.0f} ms, k={args.k})\n")
+    print_table(["retrieval", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
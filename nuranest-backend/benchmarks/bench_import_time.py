@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Import time of the API entry point, checked against a budget.
+
+Runs ``python -X importtime -c "import app.main"`` in fresh interpreters
+(--runs times, median reported), lists the top-level packages that cost the
+most, and fails (exit status 1) when:
+
+- the import takes longer than --budget-ms, or
+- any of the heavy model/index packages (torch, transformers, LangChain
+  agents, FAISS, ...) is imported; these belong behind the service warm-up
+  in PregnancyAIService, not on the path that serves /, /docs and /healthz.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --module app.agents --budget-ms 5000 --allow-heavy
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from benchmarks.common import print_table
+
+# Packages that must only be imported when the agent is loaded
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "langchain_huggingface",
+    "langchain_groq",
+    "langchain.agents",
+    "langchain_community.vectorstores",
+    "faiss",
+    "app.agents",
+)
+
+
+def measure_import(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Import ``module`` in a fresh interpreter with -X importtime.
+
+    Returns the total import time in seconds and the self time of every
+    module that got imported, in seconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    total, self_times = 0.0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        self_times[name.strip()] = int(self_us) / 1e6
+        if name.strip() == module and not name[1:].startswith(" "):
+            total = int(cumulative_us) / 1e6
+    return total, self_times
+
+
+def heavy_imports(imported) -> List[str]:
+    return sorted(name for name in imported if any(name == heavy or name.startswith(f"{heavy}.") for heavy in HEAVY_MODULES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum median import time")
+    parser.add_argument("--top", type=int, default=10, help="Top-level packages to list")
+    parser.add_argument("--allow-heavy", action="store_true", help="Don't fail on heavy imports")
+    args = parser.parse_args()
+
+    totals, self_times = [], {}
+    for _ in range(args.runs):
+        total, self_times = measure_import(args.module)
+        totals.append(total)
+    median_ms = statistics.median(totals) * 1000
+
+    by_package = defaultdict(float)
+    for name, seconds in self_times.items():
+        by_package[name.split(".")[0]] += seconds
+    top = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"\n📦 import {args.module}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {min(totals) * 1000:.0f}, max {max(totals) * 1000:.0f}), {len(self_times)} modules\n")
+    print_table(["package", "self ms"], [[name, f"{seconds * 1000:.1f}"] for name, seconds in top])
+    print()
+
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"❌ Over budget: {median_ms:.0f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    heavy = heavy_imports(self_times)
+    if heavy and not args.allow_heavy:
+        print(f"❌ Heavy modules imported: {', '.join(heavy[:10])}{' ...' if len(heavy) > 10 else ''}")
+        failed = True
+    if not failed:
+        print(f"✅ Within budget ({median_ms:.0f} / {args.budget_ms:.0f} ms), no heavy imports")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Peak memory of PDF ingestion as the corpus grows.
+
+Generates synthetic text PDFs and ingests each corpus size in a fresh
+process, comparing the streaming pipeline in ingest_local.py (load -> split ->
+embed in batches -> add) with the old collect-everything approach (all pages,
+then all chunks, then one FAISS.from_documents call). Embeddings come from a
+deterministic fake model so only the pipeline is measured.
+
+Peak RSS growth for the streaming pipeline should track the size of the
+index itself, while the collect-all baseline also holds every page and chunk
+of the corpus at once. "index MB" only counts raw vectors and chunk text, so
+the per-chunk Python overhead of the in-memory docstore (~2 KB) still shows
+up as a slowly growing "pipeline overhead" for the streaming mode.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_ingest_memory --sizes 10 100 1000
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table
+
+WORDS = (
+    "pregnancy prenatal care folic acid nausea vomiting trimester fetal movement bleeding cramping "
+    "preeclampsia blood pressure swelling headache vision gestational diabetes glucose screening "
+    "ultrasound placenta midwife labor delivery postpartum breastfeeding iron anemia fatigue"
+).split()
+
+
+def write_pdf(path: str, pages: int, rng: random.Random):
+    from pypdf import PdfWriter
+    from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for _ in range(pages):
+        page = writer.add_blank_page(612, 792)
+        lines = [
+            f"BT /F1 9 Tf 40 {760 - i * 18} Td ({' '.join(rng.choice(WORDS) for _ in range(12))}) Tj ET"
+            for i in range(40)
+        ]
+        stream = DecodedStreamObject()
+        stream.set_data("\n".join(lines).encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def make_corpus(directory: str, count: int, pages: int):
+    rng = random.Random(count)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        write_pdf(os.path.join(directory, f"guideline_{i:05d}.pdf"), pages, rng)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+
+
+def run_child(mode: str, pdf_dir: str, index_dir: str, batch_size: int):
+    """Ingest one corpus and print the measurements as JSON (runs in a fresh process)"""
+    import logging
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    import ingest_local
+
+    logging.disable(logging.INFO)
+    embeddings = DeterministicFakeEmbedding(size=384)
+    baseline_mb = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "streaming":
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            vectorstore = ingest_local.ingest_pdfs_local(
+                workers=1, rebuild=True, embeddings=embeddings, batch_size=batch_size,
+                pdf_dir=pdf_dir, index_dir=index_dir, embedding_cache=False,
+            )
+        finally:
+            sys.stdout = stdout
+    else:
+        paths = [os.path.join(pdf_dir, f) for f in sorted(os.listdir(pdf_dir))]
+        chunks = []
+        for path in paths:
+            chunks.extend(ingest_local.load_and_split_pdf(path).chunks)
+        vectorstore = FAISS.from_documents(chunks, embeddings)
+
+    seconds = time.perf_counter() - start
+    index_mb = (
+        vectorstore.index.ntotal * vectorstore.index.d * 4
+        + sum(len(doc.page_content) for doc in vectorstore.docstore._dict.values())
+    ) / (1024 * 1024)
+    print(json.dumps({
+        "chunks": vectorstore.index.ntotal,
+        "seconds": seconds,
+        "baseline_mb": baseline_mb,
+        "peak_mb": peak_rss_mb(),
+        "index_mb": index_mb,
+    }))
+
+
+def measure(mode: str, pdf_dir: str, index_dir: str, batch_size: int) -> dict:
+    command = [
+        sys.executable, "-m", "benchmarks.bench_ingest_memory", "--child", mode,
+        "--pdf-dir", pdf_dir, "--index-dir", index_dir, "--batch-size", str(batch_size),
+    ]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--pages", type=int, default=5, help="Pages per synthetic PDF")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--modes", nargs="+", default=["streaming", "collect-all"])
+    parser.add_argument("--child", choices=["streaming", "collect-all"], help=argparse.SUPPRESS)
+    parser.add_argument("--pdf-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--index-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.pdf_dir, args.index_dir, args.batch_size)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="nuranest_ingest_bench_") as workdir:
+        for size in args.sizes:
+            pdf_dir = os.path.join(workdir, f"pdfs_{size}")
+            print(f"📄 Generating {size} PDFs x {args.pages} pages...")
+            make_corpus(pdf_dir, size, args.pages)
+            for mode in args.modes:
+                result = measure(mode, pdf_dir, os.path.join(workdir, f"index_{size}_{mode}"), args.batch_size)
+                growth = result["peak_mb"] - result["baseline_mb"]
+                rows.append([
+                    size, mode, result["chunks"], f"{result['seconds']:.1f}",
+                    f"{result['peak_mb']:.0f}", f"{growth:.0f}", f"{result['index_mb']:.1f}",
+                    f"{growth - result['index_mb']:.1f}",
+                ])
+
+    print(f"\n🧠 Ingestion peak memory (batch size {args.batch_size}, {args.pages} pages per PDF)\n")
+    print_table(
+        ["pdfs", "mode", "chunks", "seconds", "peak RSS MB", "RSS growth MB", "index MB", "pipeline overhead MB"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compare the "agent" and "direct" answer pipelines against a mocked Groq LLM.
+
+Reports LLM calls per question and p50/p95 latency per question for each mode.
+The mock sleeps for a fixed (jittered) time per call, so the numbers reflect
+pipeline overhead and round trips rather than real model speed.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_pipeline_modes --llm-latency 0.2 --rounds 5
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, List, Optional
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app import agents
+from app.agents import PregnancyHealthAgent
+from benchmarks.common import print_table, summarize_latencies
+
+QUESTIONS = [
+    "What foods should I avoid during pregnancy?",
+    "Is it safe to exercise during the second trimester?",
+    "I am 22 weeks pregnant and have a headache and swelling",
+    "How much folic acid should I take before conception?",
+    "What are the signs of preterm labor?",
+    "What is the capital of France?",
+    "Can you recommend a good laptop?",
+]
+
+CORPUS = [
+    "Pregnant women should avoid raw fish, unpasteurized dairy and high-mercury fish.",
+    "Moderate exercise such as walking and swimming is safe for most pregnancies.",
+    "Headache, blurry vision and swelling after 20 weeks can indicate preeclampsia.",
+    "Take 400 micrograms of folic acid daily before conception and in early pregnancy.",
+    "Regular contractions, pelvic pressure and watery discharge may signal preterm labor.",
+]
+
+
+class MockGroq(BaseChatModel):
+    """Chat model that imitates Groq's tool-calling behaviour with a fixed latency"""
+
+    latency: float = 0.2
+    calls: int = 0
+    rng: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock-groq"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.calls += 1
+        time.sleep(self.latency * self.rng.uniform(0.7, 1.5))
+
+        # First agent turn: ask for the search tool, like the real model does
+        if kwargs.get("tools") and not any(isinstance(m, ToolMessage) for m in messages):
+            question = next(m.content for m in reversed(messages) if isinstance(m, HumanMessage))
+            call_id = f"call_{self.calls}"
+            args = {"query": question}
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": "pregnancy_search_tool", "args": args, "id": call_id}],
+                additional_kwargs={"tool_calls": [{
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": "pregnancy_search_tool", "arguments": json.dumps(args)},
+                }]},
+            )
+        else:
+            message = AIMessage(content="During pregnancy, it's recommended to follow your provider's advice.")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def build_agent(mode: str, llm: MockGroq) -> PregnancyHealthAgent:
+    agent = PregnancyHealthAgent(pipeline_mode=mode)
+    # Repeated rounds would otherwise be answered from the answer cache, not by the pipeline
+    agent.answer_cache = None
+    agent.embeddings = DeterministicFakeEmbedding(size=384)
+    agent.vectorstore = FAISS.from_texts(
+        CORPUS, agent.embeddings, metadatas=[{"source": f"medical_data/doc{i}.pdf"} for i in range(len(CORPUS))]
+    )
+    agent.retriever = agent.vectorstore.as_retriever(search_kwargs={"k": agent.search_k})
+    agent.llm = llm
+    agent._build_pipeline()
+    return agent
+
+
+def run_mode(mode: str, rounds: int, latency: float, seed: int) -> dict:
+    llm = MockGroq(latency=latency, rng=random.Random(seed))
+    agent = build_agent(mode, llm)
+    latencies, calls = [], []
+    for _ in range(rounds):
+        for question in QUESTIONS:
+            before = llm.calls
+            start = time.perf_counter()
+            agent.process_question(question)
+            latencies.append(time.perf_counter() - start)
+            calls.append(llm.calls - before)
+    return {
+        "mode": mode,
+        "questions": len(latencies),
+        "llm_calls_per_question": sum(calls) / len(calls),
+        "max_llm_calls": max(calls),
+        **summarize_latencies(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3, help="Times to ask each question")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mean mocked LLM latency in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Keep the pipelines' progress prints out of the report
+    agents.print = lambda *a, **k: None
+
+    results = [run_mode(mode, args.rounds, args.llm_latency, args.seed) for mode in ("agent", "direct")]
+
+    print(f"\n🏁 Pipeline benchmark ({len(QUESTIONS)} questions x {args.rounds} rounds, "
+          f"mock LLM ~{args.llm_latency * 1000:.0f} ms/call)\n")
+    print_table(
+        ["mode", "questions", "llm calls/q", "max calls", "p50 ms", "p95 ms", "mean ms"],
+        [[r["mode"], r["questions"], f"{r['llm_calls_per_question']:.2f}", r["max_llm_calls"],
+          f"{r['p50_ms']:.1f}", f"{r['p95_ms']:.1f}", f"{r['mean_ms']:.1f}"] for r in results],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Phrase matching cost as the symptom rule tables grow.
+
+Compares the per-phrase ``phrase in text`` scan the rule engines used to do
+with the compiled Aho-Corasick matcher, on the same question, for synthetic
+phrase tables of increasing size.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_rule_matching --sizes 10 100 1000 5000
+"""
+import argparse
+import random
+import string
+import time
+
+from app.rule_index import CombinationRuleIndex
+from app.phrase_matcher import PhraseMatcher
+from benchmarks.common import print_table, time_per_call
+
+QUESTION = (
+    "i am 22 weeks pregnant and since yesterday i have had a headache, blurry vision "
+    "and swelling in my feet, plus some mild nausea and fatigue in the evenings"
+)
+REAL_PHRASES = ["headache", "blurry vision", "swelling", "mild nausea", "fatigue"]
+
+
+def synthetic_phrases(count: int, rng: random.Random) -> list:
+    phrases = list(REAL_PHRASES)
+    while len(phrases) < count:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        phrases.append(" ".join(words))
+    return phrases
+
+
+def synthetic_rules(count: int, phrases: list, rng: random.Random) -> list:
+    rules = [{"symptoms": ["headache", "blurry vision", "swelling"]}]
+    while len(rules) < count:
+        rules.append({"symptoms": rng.sample(phrases, rng.randint(2, 4))})
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000, 20000])
+    parser.add_argument("--rule-sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = []
+    for size in args.sizes:
+        phrases = synthetic_phrases(size, rng)
+        build_start = time.perf_counter()
+        matcher = PhraseMatcher(phrases)
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        scan = time_per_call(lambda: [p for p in phrases if p in QUESTION], args.repeat)
+        compiled = time_per_call(lambda: matcher.find_all(QUESTION), args.repeat)
+        assert set(matcher.find_all(QUESTION)) == {p for p in phrases if p in QUESTION}
+        rows.append([size, f"{build_ms:.1f}", f"{scan * 1e6:.1f}", f"{compiled * 1e6:.1f}", f"{scan / compiled:.1f}x"])
+
+    print(f"\n🔎 Phrase matching on a {len(QUESTION)}-char question\n")
+    print_table(["phrases", "build ms", "substring scan us", "automaton us", "speedup"], rows)
+
+    rows = []
+    for size in args.rule_sizes:
+        phrases = synthetic_phrases(max(50, size // 2), rng)
+        rules = synthetic_rules(size, phrases, rng)
+        matches = PhraseMatcher(phrases).find_all(QUESTION)
+        index = CombinationRuleIndex(rules)
+
+        def counting():
+            return [r for r in rules if sum(1 for s in r["symptoms"] if s in QUESTION) >= len(r["symptoms"])]
+
+        def bitset():
+            return index.full_matches(index.detected_mask(matches))
+
+        def partial():
+            return index.partial_matches(index.detected_mask(matches))
+
+        assert [rules[i] for i in bitset()] == counting()
+        count_t = time_per_call(counting, args.repeat)
+        bitset_t = time_per_call(bitset, args.repeat)
+        partial_t = time_per_call(partial, args.repeat)
+        rows.append([size, f"{count_t * 1e6:.1f}", f"{bitset_t * 1e6:.1f}", f"{partial_t * 1e6:.1f}",
+                     f"{count_t / bitset_t:.1f}x"])
+
+    print("\n🧩 Combination rule evaluation (after phrase matching)\n")
+    print_table(["rules", "symptom count us", "bitmask us", "partial ranking us", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
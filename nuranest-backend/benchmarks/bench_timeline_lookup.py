@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Timeline rule lookup cost as TIMELINE_RULES grows.
+
+Compares the linear scan over every rule (week range check plus a substring
+test per symptom) with the precomputed per-day TimelineIndex, for synthetic
+rule tables of increasing size. Both start from the same phrase matches.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_timeline_lookup --sizes 5 50 500 5000
+"""
+import argparse
+import random
+import string
+import time
+
+from app.phrase_matcher import PhraseMatcher
+from app.rule_index import TimelineIndex
+from benchmarks.common import print_table, time_per_call
+
+QUESTION = "i am 22 weeks pregnant with a headache, blurry vision and swelling"
+WEEK = 22
+
+
+def synthetic_rules(count: int, rng: random.Random) -> list:
+    rules = [{"min_week": 20, "max_week": 40, "symptoms": ["blurry vision", "headache", "swelling"]}]
+    while len(rules) < count:
+        start = rng.randint(0, 40)
+        symptoms = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))) for _ in range(rng.randint(2, 5))]
+        rules.append({"min_week": start, "max_week": rng.randint(start, 42), "symptoms": symptoms})
+    return rules
+
+
+def scan(rules: list, week: int, text: str) -> list:
+    found = []
+    for index, rule in enumerate(rules):
+        if rule["min_week"] <= week <= rule["max_week"]:
+            for position, symptom in enumerate(rule["symptoms"]):
+                if symptom in text:
+                    found.append((index, position))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    rows = []
+    for size in args.sizes:
+        rules = synthetic_rules(size, rng)
+        build_start = time.perf_counter()
+        index = TimelineIndex(rules)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        matches = PhraseMatcher(s for r in rules for s in r["symptoms"]).find_all(QUESTION)
+
+        assert index.lookup(index.for_week(WEEK), matches) == scan(rules, WEEK, QUESTION)
+        scan_t = time_per_call(lambda: scan(rules, WEEK, QUESTION), args.repeat)
+        index_t = time_per_call(lambda: index.lookup(index.for_week(WEEK, 3), matches), args.repeat)
+        rows.append([size, f"{build_ms:.1f}", f"{scan_t * 1e6:.2f}", f"{index_t * 1e6:.2f}", f"{scan_t / index_t:.1f}x"])
+
+    print(f"\n📅 Timeline lookup at week {WEEK}\n")
+    print_table(["rules", "index build ms", "linear scan us", "indexed lookup us", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compressed vector storage: bundle size saved vs recall lost.
+
+Builds each --types index with every --storage precision from
+app.faiss_index (float32, float16 and int8 scalar quantization), with and
+without exact re-scoring of the top ``rescore_factor * k`` candidates, and
+reports per configuration:
+
+- bundle MB:      index.faiss, the file the API loads and deploys
+- vectors.npy MB: the exact float32 vectors kept for re-scoring, a separate
+                  file (memory-mapped here as in the API) that can be left
+                  out of a deployment at the cost of re-scoring
+- p50 / p95 latency of one query at a time, like the API
+- recall@k of the top-k ids vs an exact float32 flat search
+
+The corpus is synthetic (clustered, L2-normalized 384-dim vectors like
+MiniLM chunk embeddings) unless --vectorstore points at a real index.
+
+Usage (from nuranest-backend/):
+    python -m benchmarks.bench_vector_storage --vectors 50000 --k 3
+    python -m benchmarks.bench_vector_storage --types flat hnsw --rescore-factors 0 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+from app.faiss_index import (
+    INDEX_TYPES, VECTOR_STORAGE, IndexConfig, RescoringIndex, base_index_of, build_index, vector_storage_of,
+)
+from benchmarks.bench_faiss_index import corpus_from_vectorstore, recall, search_each, synthetic_corpus
+from benchmarks.common import print_table, summarize_latencies
+
+
+def size_mb(index) -> float:
+    return faiss.serialize_index(index).nbytes / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--types", nargs="+", choices=[t for t in INDEX_TYPES if t != "ivf_pq"], default=["flat", "hnsw"])
+    parser.add_argument("--storage", nargs="+", choices=VECTOR_STORAGE, default=list(VECTOR_STORAGE))
+    parser.add_argument("--rescore-factors", type=int, nargs="+", default=[0, 4],
+                        help="Candidates re-scored exactly per result (0 = compressed scores only)")
+    parser.add_argument("--nlist", type=int, default=0)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--vectorstore", help="Use the vectors of an existing FAISS folder instead")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.vectorstore:
+        vectors, queries = corpus_from_vectorstore(args.vectorstore, args.queries, rng)
+    else:
+        vectors, queries = synthetic_corpus(args.vectors, args.dimension, args.queries, rng)
+    print(f"📚 {len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}")
+
+    _, truth = search_each(build_index(vectors, IndexConfig("flat")), queries, args.k)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        vectors_path = os.path.join(tmp, "vectors.npy")
+        np.save(vectors_path, vectors)
+        vectors_mb = os.path.getsize(vectors_path) / (1024 * 1024)
+
+        for index_type in args.types:
+            reference_mb = None
+            for storage in args.storage:
+                # float32 is already exact, so re-scoring would only duplicate it
+                factors = [0] if storage == "float32" else args.rescore_factors
+                for factor in factors:
+                    config = IndexConfig(
+                        index_type, nlist=args.nlist, nprobe=args.nprobe, ef_search=args.ef_search,
+                        vector_storage=storage, rescore_factor=factor,
+                    )
+                    start = time.perf_counter()
+                    index = build_index(vectors, config)
+                    build_seconds = time.perf_counter() - start
+                    if isinstance(index, RescoringIndex):
+                        # Re-score from the memory-mapped file, as the API does
+                        index = RescoringIndex(index.index, np.load(vectors_path, mmap_mode="r"), factor)
+                    bundle_mb = size_mb(base_index_of(index))
+                    reference_mb = reference_mb or bundle_mb
+
+                    latencies, results = search_each(index, queries, args.k)
+                    stats = summarize_latencies(latencies)
+                    rows.append([
+                        index_type, vector_storage_of(index), f"{factor}x" if factor else "off",
+                        f"{build_seconds:.2f}", f"{bundle_mb:.1f}", f"{bundle_mb / reference_mb:.2f}x",
+                        f"{vectors_mb:.1f}" if factor else "-", f"{stats['p50_ms']:.3f}", f"{stats['p95_ms']:.3f}",
+                        f"{recall(results, truth):.3f}",
+                    ])
+
+    print(f"\n🗜️ Vector storage: index.faiss size vs recall@{args.k} (vs exact float32 flat)\n")
+    print_table(
+        ["index", "storage", "rescore", "build s", "bundle MB", "vs float32", "vectors.npy MB",
+         "p50 ms", "p95 ms", f"recall@{args.k}"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
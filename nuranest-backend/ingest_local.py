@@ -1,11 +1,28 @@
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
 import os
+import time
 from pathlib import Path
 import logging
 
+from app.config import settings
+from app.chunk_display import annotate_chunk
+from app.embedding_backends import EMBEDDING_BACKENDS, backend_of, load_embeddings
+from app.embedding_cache import CachedEmbeddings, EmbeddingCache
+from app.faiss_index import (
+    INDEX_TYPES, VECTOR_STORAGE, IndexConfig, build_index, has_exact_vectors, index_type_of, to_flat, vector_storage_of,
+)
+from app.ingest_manifest import IngestManifest, ManifestEntry, chunk_ids_for, file_sha256
+from app.near_duplicates import NearDuplicateIndex
+from app.vector_store import EXACT_VECTORS_FILENAME, INDEX_FILENAME, load_vectorstore, save_vectorstore
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,90 +30,410 @@ logger = logging.getLogger(__name__)
 # Directory where PDFs are stored
 pdf_folder = "medical_data"
 
-def ingest_pdfs_local():
-    """Ingest PDFs and create vectorstore using free local embeddings"""
+# Directory where the vectorstore and its ingest manifest are saved
+vectorstore_folder = settings.vectorstore_path
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 150
+
+_splitter = None
+
+
+def get_splitter() -> RecursiveCharacterTextSplitter:
+    """Text splitter shared by every file handled in this process"""
+    global _splitter
+    if _splitter is None:
+        _splitter = RecursiveCharacterTextSplitter(
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
+            length_function=len,
+            separators=["\n\n", "\n", " ", ""]
+        )
+    return _splitter
+
+
+@dataclass
+class LoadedPDF:
+    """Pages and chunks extracted from one PDF (or the error that stopped it)"""
+    filename: str
+    pages: int = 0
+    chunks: List = field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def load_and_split_pdf(file_path: str) -> LoadedPDF:
+    """Load and chunk a single PDF, precomputing each chunk's display fields; runs inside a worker process"""
+    filename = os.path.basename(file_path)
+    start = time.perf_counter()
+    try:
+        docs = PyPDFLoader(file_path).load()
+        chunks = [annotate_chunk(chunk) for chunk in get_splitter().split_documents(docs)]
+        return LoadedPDF(filename, pages=len(docs), chunks=chunks, seconds=time.perf_counter() - start)
+    except Exception as e:
+        return LoadedPDF(filename, error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - start)
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """Worker processes to use; 0 or None means one per CPU"""
+    workers = settings.ingest_workers if workers is None else workers
+    return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+
+def resolve_max_pending(workers: int, max_pending: Optional[int] = None) -> int:
+    """Loaded PDFs allowed to wait for embedding; 0 or None means two per worker"""
+    max_pending = settings.ingest_max_pending_files if max_pending is None else max_pending
+    return max_pending if max_pending and max_pending > 0 else 2 * workers
+
+
+def iter_pdfs_parallel(file_paths: List[str], workers: int, max_pending: int) -> Iterator[LoadedPDF]:
+    """
+    Load and split PDFs across a process pool, yielding them one at a time.
+
+    Results come back in the order of ``file_paths`` regardless of which
+    worker finishes first, and a file that fails to load only affects
+    itself. A crashed worker (segfault, OOM kill) breaks the whole pool: it
+    is recreated, the files that were in flight are retried one at a time,
+    and the one that crashes again is reported as failed. At most
+    ``max_pending`` files are submitted ahead of the consumer, so memory
+    stays bounded however large the corpus is.
+    """
+    if workers <= 1 or len(file_paths) <= 1:
+        for path in file_paths:
+            yield load_and_split_pdf(path)
+        return
+
+    remaining = deque(file_paths)
+    suspects = set()  # Files in flight when a worker crashed; each is retried alone
+    limit = max(max_pending, workers)
+    while remaining:
+        with ProcessPoolExecutor(max_workers=min(workers, len(remaining))) as pool:
+            pending = deque()
+            while remaining or pending:
+                # Keep the pool fed, except while a suspect runs on its own
+                while remaining and len(pending) < limit and not any(p in suspects for p, _ in pending):
+                    if pending and remaining[0] in suspects:
+                        break
+                    path = remaining.popleft()
+                    pending.append((path, pool.submit(load_and_split_pdf, path)))
+                path, future = pending.popleft()
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    in_flight = [path] + [p for p, _ in pending]
+                    if path in suspects and len(in_flight) == 1:
+                        suspects.discard(path)
+                        logger.error(f"💥 {os.path.basename(path)} crashed its worker again - skipping it")
+                        yield LoadedPDF(os.path.basename(path), error=f"worker crashed ({type(e).__name__})")
+                    else:
+                        logger.warning(f"💥 A worker crashed - retrying {len(in_flight)} in-flight file(s) one at a time")
+                        suspects.update(in_flight)
+                        remaining.extendleft(reversed(in_flight))
+                    break  # Replace the broken pool
+                except Exception as e:
+                    result = LoadedPDF(os.path.basename(path), error=f"{type(e).__name__}: {e}")
+                suspects.discard(path)
+                yield result
+
+
+@dataclass
+class IngestStats:
+    """Running totals of a streaming ingestion"""
+    pages: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    failed: List[str] = field(default_factory=list)
+    entries: Dict[str, ManifestEntry] = field(default_factory=dict)
+    # Kept chunk ID -> sources of the near-duplicates collapsed into it, not yet recorded in the index
+    merged_sources: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def iter_chunk_batches(loaded: Iterable[LoadedPDF], hashes: Dict[str, str], batch_size: int,
+                       stats: IngestStats, dedup: Optional[NearDuplicateIndex] = None) -> Iterator[Tuple[list, List[str]]]:
+    """
+    Regroup the chunks of loaded PDFs into fixed-size (chunks, ids) embedding batches.
+
+    With a NearDuplicateIndex, chunks that nearly duplicate an earlier chunk
+    of this run are dropped and their source is recorded in
+    ``stats.merged_sources`` against the chunk that was kept.
+    """
+    batch, batch_ids = [], []
+    for result in loaded:
+        if result.error:
+            logger.error(f"Error loading {result.filename}: {result.error}")
+            stats.failed.append(result.filename)
+            continue
+        logger.info(f"Loaded: {result.filename} ({result.pages} pages, {len(result.chunks)} chunks, {result.seconds:.2f}s)")
+        entry = ManifestEntry(hashes[result.filename], result.pages, [])
+        stats.entries[result.filename] = entry
+        stats.pages += result.pages
+        stats.chunks += len(result.chunks)
+        for chunk, chunk_id in zip(result.chunks, chunk_ids_for(result.filename, hashes[result.filename], len(result.chunks))):
+            kept = dedup.add((chunk_id, result.filename), chunk.page_content) if dedup is not None else None
+            if kept is not None:
+                kept_id, kept_file = kept
+                stats.duplicates += 1
+                stats.merged_sources.setdefault(kept_id, []).append(chunk.metadata.get("source", result.filename))
+                if kept_file != result.filename and kept_file not in entry.duplicate_of:
+                    entry.duplicate_of.append(kept_file)
+                continue
+            entry.chunk_ids.append(chunk_id)
+            batch.append(chunk)
+            batch_ids.append(chunk_id)
+            if len(batch) >= batch_size:
+                yield batch, batch_ids
+                batch, batch_ids = [], []
+    if batch:
+        yield batch, batch_ids
+
+
+def record_merged_sources(vectorstore, stats: IngestStats):
+    """Add the sources of collapsed near-duplicates to the metadata of the chunks that were kept"""
+    for kept_id in list(stats.merged_sources):
+        doc = vectorstore.docstore.search(kept_id)
+        if isinstance(doc, str):
+            continue  # Kept chunk is still waiting in the current batch
+        sources = doc.metadata.get("sources") or [doc.metadata.get("source", "Unknown source")]
+        for source in stats.merged_sources.pop(kept_id):
+            if source not in sources:
+                sources.append(source)
+        doc.metadata["sources"] = sources
+
+
+def build_embeddings(backend: str = None):
+    """Load the local embedding model used for the index (torch, ONNX or int8 ONNX)"""
+    logger.info("📥 Loading embedding model (the first download may take a few minutes)...")
+    # Use a lightweight, free embedding model, on CPU to avoid GPU requirements
+    embeddings = load_embeddings(backend=backend)
+    logger.info(f"✅ Embedding model loaded successfully ({backend_of(embeddings)} backend)")
+    return embeddings
+
+
+def index_settings(dedup_threshold: float) -> dict:
+    """Everything that invalidates existing vectors when it changes"""
+    return {
+        "embedding_model": settings.embedding_model,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "dedup_threshold": dedup_threshold,
+    }
+
+
+def ingest_pdfs_local(workers: Optional[int] = None, rebuild: bool = False, embeddings=None,
+                      batch_size: Optional[int] = None, max_pending: Optional[int] = None,
+                      pdf_dir: str = pdf_folder, index_dir: str = vectorstore_folder,
+                      embedding_cache: Optional[bool] = None, dedup_threshold: Optional[float] = None,
+                      index_type: Optional[str] = None, embedding_backend: Optional[str] = None,
+                      vector_storage: Optional[str] = None):
+    """
+    Ingest PDFs and create or update the vectorstore using free local embeddings.
+
+    Only PDFs that were added or changed since the last run are loaded and
+    embedded; vectors of changed or deleted PDFs are removed by ID. A full
+    rebuild happens with ``rebuild=True``, when there is no index or manifest
+    yet, or when the embedding model or chunking settings changed.
+
+    PDFs stream through load -> split -> embed -> add in batches of
+    ``batch_size`` chunks, so peak memory does not grow with the corpus
+    (apart from the index itself). Chunk embeddings are looked up in the
+    on-disk embedding cache first, so repeated text is embedded only once.
+    Chunks that nearly duplicate an earlier chunk of the same run (MinHash
+    similarity >= ``dedup_threshold``, 0 disables) are collapsed into it, and
+    the kept chunk lists every source file in ``metadata["sources"]``. PDFs
+    whose duplicates were collapsed into a changed PDF are re-indexed with it
+    ("dependent"), so deleting a file never loses another file's text.
+
+    Vectors are added to a flat index; at the end it is rebuilt as the
+    configured FAISS index type (``index_type`` / FAISS_INDEX_TYPE).
+    """
     logger.info("🚀 Starting PDF ingestion with local embeddings...")
     
     # Check if folder exists
-    if not os.path.exists(pdf_folder):
-        raise FileNotFoundError(f"PDF folder '{pdf_folder}' not found")
+    if not os.path.exists(pdf_dir):
+        raise FileNotFoundError(f"PDF folder '{pdf_dir}' not found")
     
-    # Step 1: Load all PDFs
-    logger.info("📄 Loading PDFs...")
-    docs = []
-    pdf_files = [f for f in os.listdir(pdf_folder) if f.endswith(".pdf")]
+    pdf_files = sorted(f for f in os.listdir(pdf_dir) if f.endswith(".pdf"))
     
     if not pdf_files:
-        raise FileNotFoundError(f"No PDF files found in '{pdf_folder}'")
-    
-    logger.info(f"Found {len(pdf_files)} PDF files")
-    
-    for filename in pdf_files:
-        try:
-            file_path = os.path.join(pdf_folder, filename)
-            logger.info(f"Loading: {filename}")
-            loader = PyPDFLoader(file_path)
-            docs.extend(loader.load())
-        except Exception as e:
-            logger.error(f"Error loading {filename}: {e}")
-            continue
+        raise FileNotFoundError(f"No PDF files found in '{pdf_dir}'")
     
-    if not docs:
-        raise ValueError("No documents loaded from PDFs")
+    # Step 1: Work out what changed since the last run
+    dedup_threshold = settings.dedup_threshold if dedup_threshold is None else dedup_threshold
+    index_config = IndexConfig.from_settings(settings, index_type=index_type, vector_storage=vector_storage)
+    hashes = {f: file_sha256(os.path.join(pdf_dir, f)) for f in pdf_files}
+    manifest = None if rebuild else IngestManifest.load(index_dir)
+    if manifest is not None and manifest.settings != index_settings(dedup_threshold):
+        logger.info("♻️ Embedding model, chunking or dedup settings changed - rebuilding the whole index")
+        manifest = None
+    if manifest is not None and not os.path.exists(os.path.join(index_dir, INDEX_FILENAME)):
+        manifest = None
+    if manifest is not None and not manifest.index.get("exact", manifest.index.get("built") != "ivf_pq"):
+        logger.info("♻️ The index keeps no exact vectors (IVF-PQ, or compressed without re-scoring) - rebuilding the whole index")
+        manifest = None
+    if (manifest is not None and manifest.index.get("vector_storage", "float32") != "float32"
+            and manifest.index.get("rescore") and not os.path.exists(os.path.join(index_dir, EXACT_VECTORS_FILENAME))):
+        logger.info(f"♻️ {EXACT_VECTORS_FILENAME} is missing - rebuilding the whole index")
+        manifest = None
     
-    logger.info(f"✅ Loaded {len(docs)} documents from PDFs")
+    incremental = manifest is not None
+    if not incremental:
+        manifest = IngestManifest(index_settings(dedup_threshold))
+    plan = manifest.plan(hashes)
+    logger.info(
+        f"🧾 {len(plan.added)} added, {len(plan.changed)} changed, {len(plan.removed)} removed, "
+        f"{len(plan.unchanged)} unchanged, {len(plan.dependent)} dependent PDF(s)"
+    )
     
-    # Step 2: Split into chunks
-    logger.info("✂️ Splitting documents into chunks...")
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000, 
-        chunk_overlap=150,
-        length_function=len,
-        separators=["\n\n", "\n", " ", ""]
+    index_current = incremental and {k: v for k, v in manifest.index.items() if k not in ("built", "exact")} == index_config.build_params()
+    if incremental and not plan.has_changes() and index_current:
+        logger.info("✅ Vectorstore is up to date - nothing to ingest")
+        return load_vectorstore(index_dir, embeddings or build_embeddings(embedding_backend))
+    
+    # Step 2: Stream new or changed PDFs through load -> split -> embed -> add
+    workers = resolve_workers(workers)
+    max_pending = resolve_max_pending(workers, max_pending)
+    batch_size = batch_size or settings.ingest_batch_size
+    logger.info(
+        f"📄 Ingesting {len(plan.to_load)} PDF files with {workers} worker(s), "
+        f"{batch_size} chunks per embedding batch, up to {max_pending} files buffered..."
     )
-    chunks = splitter.split_documents(docs)
     
-    logger.info(f"✅ Created {len(chunks)} chunks")
+    # Step 3: Generate embeddings using free local model, reusing cached ones
+    embeddings = embeddings or build_embeddings(embedding_backend)
+    use_cache = settings.embedding_cache_enabled if embedding_cache is None else embedding_cache
+    if use_cache:
+        model_name = getattr(embeddings, "model_name", type(embeddings).__name__)
+        if backend_of(embeddings) != "torch":
+            # ONNX vectors are close to, not identical with, torch ones; keep them apart in the cache
+            model_name = f"{settings.embedding_model}#{backend_of(embeddings)}"
+        embeddings = CachedEmbeddings(embeddings, model_name, EmbeddingCache(settings.embedding_cache_dir))
     
-    # Step 3: Generate embeddings using free local model
-    logger.info("🔍 Generating embeddings with free local model...")
-    logger.info("📥 Downloading embedding model (this may take a few minutes)...")
+    vectorstore = None
+    if incremental:
+        logger.info("💾 Updating FAISS vectorstore...")
+        vectorstore = load_vectorstore(index_dir, embeddings, writable=True)
+        vectorstore.index = to_flat(vectorstore.index)
+        # Chunks indexed before display fields were stored get them on this save
+        for doc_id in vectorstore.index_to_docstore_id.values():
+            doc = vectorstore.docstore.search(doc_id)
+            if "snippet" not in doc.metadata:
+                annotate_chunk(doc)
+        stale_ids = manifest.chunk_ids(plan.to_delete)
+        if stale_ids:
+            vectorstore.delete(stale_ids)
+            logger.info(f"🗑️ Removed {len(stale_ids)} vectors of changed or deleted PDFs")
     
-    # Use a lightweight, free embedding model
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={'device': 'cpu'},  # Use CPU to avoid GPU requirements
-        encode_kwargs={'normalize_embeddings': True}
-    )
+    # Step 4: Drop near-duplicate chunks, then embed and index one batch at a time
+    dedup = NearDuplicateIndex(threshold=dedup_threshold) if dedup_threshold > 0 else None
+    stats = IngestStats()
+    pipeline_start = time.perf_counter()
+    embed_seconds = 0.0
+    loaded = iter_pdfs_parallel([os.path.join(pdf_dir, f) for f in plan.to_load], workers, max_pending)
+    for batch, batch_ids in iter_chunk_batches(loaded, hashes, batch_size, stats, dedup):
+        embed_start = time.perf_counter()
+        if vectorstore is None:
+            logger.info("💾 Creating FAISS vectorstore...")
+            vectorstore = FAISS.from_documents(batch, embeddings, ids=batch_ids)
+        else:
+            vectorstore.add_documents(batch, ids=batch_ids)
+        embed_seconds += time.perf_counter() - embed_start
+        record_merged_sources(vectorstore, stats)
+        logger.info(f"🔍 Embedded {len(batch)} chunks ({vectorstore.index.ntotal} vectors in index)")
+    pipeline_seconds = time.perf_counter() - pipeline_start
     
-    logger.info("✅ Embedding model loaded successfully")
+    if vectorstore is None:
+        raise ValueError("No documents loaded from PDFs")
+    record_merged_sources(vectorstore, stats)
     
-    # Step 4: Create vectorstore directly (simpler approach)
-    logger.info("💾 Creating FAISS vectorstore...")
+    # Step 5: Turn the flat index into the configured index type
+    index_seconds = 0.0
+    if index_config.index_type != "flat" or index_config.vector_storage != "float32":
+        logger.info(
+            f"🏗️ Building {index_config.index_type} index ({index_config.vector_storage} vectors) "
+            f"over {vectorstore.index.ntotal} vectors..."
+        )
+        index_start = time.perf_counter()
+        vectorstore.index = build_index(vectorstore.index.reconstruct_n(0, vectorstore.index.ntotal), index_config)
+        index_seconds = time.perf_counter() - index_start
+    # "built" can differ from the requested type when there were too few vectors to train it
+    manifest.index = {
+        **index_config.build_params(),
+        "built": index_type_of(vectorstore.index),
+        "exact": has_exact_vectors(vectorstore.index),
+    }
+    
+    pages, chunks, failed = stats.pages, stats.chunks, stats.failed
+    indexed = chunks - stats.duplicates
+    logger.info(
+        f"✅ Ingested {pages} pages as {chunks} chunks in {pipeline_seconds:.2f}s "
+        f"({pages / max(pipeline_seconds, 1e-9):.1f} pages/s, {chunks / max(pipeline_seconds, 1e-9):.1f} chunks/s)"
+    )
     
-    # Create vectorstore directly - this handles embeddings automatically
-    vectorstore = FAISS.from_documents(chunks, embeddings)
+    # Failed PDFs are left out of the manifest so the next run retries them
+    for name in plan.to_delete:
+        manifest.files.pop(name, None)
+    manifest.files.update(stats.entries)
     
-    # Save vectorstore
+    # Save vectorstore first, then the manifest that describes it
     logger.info("💾 Saving vectorstore...")
-    vectorstore.save_local("vectorstore_local")
+    save_vectorstore(vectorstore, index_dir)
+    manifest.save(index_dir)
     
-    logger.info("✅ Ingestion complete! Vectorstore saved to 'vectorstore_local' directory")
+    logger.info(f"✅ Ingestion complete! Vectorstore saved to '{index_dir}' directory")
     
     # Print summary
     print(f"\n🎉 PDF Ingestion Summary (Local Embeddings):")
-    print(f"📄 PDFs processed: {len(pdf_files)}")
-    print(f"📝 Documents loaded: {len(docs)}")
-    print(f"✂️ Chunks created: {len(chunks)}")
-    print(f"🔍 Embeddings generated: {len(chunks)}")
-    print(f"💾 Vectorstore saved to: vectorstore_local/")
+    print(f"🧾 Mode: {'incremental' if incremental else 'full rebuild'} "
+          f"({len(plan.added)} added, {len(plan.changed)} changed, {len(plan.removed)} removed, "
+          f"{len(plan.unchanged)} unchanged, {len(plan.dependent)} dependent)")
+    print(f"📄 PDFs processed: {len(plan.to_load) - len(failed)}/{len(plan.to_load)} ({workers} worker(s))")
+    if failed:
+        print(f"❌ PDFs failed: {', '.join(failed)}")
+    print(f"📝 Pages loaded: {pages}")
+    print(f"✂️ Chunks created: {chunks}")
+    if dedup is not None:
+        print(f"🧬 Near-duplicates collapsed: {stats.duplicates} "
+              f"({stats.duplicates / max(chunks, 1):.1%} fewer vectors, threshold {dedup_threshold})")
+    print(f"⚡ Pipeline: {pipeline_seconds:.2f}s ({pages / max(pipeline_seconds, 1e-9):.1f} pages/s, {chunks / max(pipeline_seconds, 1e-9):.1f} chunks/s)")
+    print(f"🔍 Chunks embedded: {indexed} in {embed_seconds:.2f}s ({indexed / max(embed_seconds, 1e-9):.1f} chunks/s)")
+    if isinstance(embeddings, CachedEmbeddings):
+        cache_stats = embeddings.stats()
+        print(f"🗃️ Embedding cache: {cache_stats['cache_hits']} hits, {cache_stats['embedded']} embedded "
+              f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['duplicates']} duplicate chunks in this run")
+        embeddings.cache.close()
+    print(f"📚 Vectors in index: {vectorstore.index.ntotal} ({manifest.index['built']}, {vector_storage_of(vectorstore.index)}"
+          f"{f', built in {index_seconds:.2f}s' if index_seconds else ''})")
+    print(f"💾 Vectorstore saved to: {index_dir}/")
     print(f"💰 Cost: FREE (no API charges)")
     
     return vectorstore
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local FAISS vectorstore from medical_data/")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to load and split PDFs (default: INGEST_WORKERS, 0 = one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Chunks embedded and added per batch (default: INGEST_BATCH_SIZE)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Ignore the manifest and re-index every PDF")
+    parser.add_argument("--dedup-threshold", type=float, default=None,
+                        help="MinHash similarity for collapsing near-duplicate chunks, 0 disables (default: DEDUP_THRESHOLD)")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default=None,
+                        help="FAISS index to build (default: FAISS_INDEX_TYPE)")
+    parser.add_argument("--vector-storage", choices=VECTOR_STORAGE, default=None,
+                        help="Store vectors as float32, float16 or int8 (default: FAISS_VECTOR_STORAGE)")
+    parser.add_argument("--no-embedding-cache", action="store_true",
+                        help="Embed every chunk instead of reusing cached embeddings")
+    parser.add_argument("--embedding-backend", choices=EMBEDDING_BACKENDS, default=None,
+                        help="Run the embedding model on torch, onnx or onnx-int8 (default: EMBEDDING_BACKEND)")
+    args = parser.parse_args()
     try:
-        vectorstore = ingest_pdfs_local()
+        vectorstore = ingest_pdfs_local(
+            workers=args.workers, rebuild=args.rebuild, batch_size=args.batch_size,
+            embedding_cache=False if args.no_embedding_cache else None,
+            dedup_threshold=args.dedup_threshold, index_type=args.index_type,
+            embedding_backend=args.embedding_backend, vector_storage=args.vector_storage
+        )
         print("\n✅ Ready to use your pregnancy AI RAG system with free local embeddings!")
         print("💡 Note: Local embeddings may be slightly less accurate than OpenAI, but they're free!")
     except Exception as e:
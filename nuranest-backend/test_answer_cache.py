@@ -0,0 +1,25 @@
+"""
+Checks that similar questions with clinically different rule matches don't share a cached answer
+"""
+import pytest
+
+from app.answer_cache import SemanticAnswerCache
+from app.query_analysis import analyze_query
+
+# Every question gets the same embedding, so only the guard can tell them apart
+EMBEDDING = [1.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("first, second", [
+    ("I'm 30 weeks, is a headache normal?", "I'm 30 weeks, is a headache with swelling normal?"),
+    ("Is bleeding in the first trimester normal?", "Is bleeding in the third trimester normal?"),
+])
+def test_different_matches_miss_the_cache(first, second):
+    first_analysis, second_analysis = analyze_query(first), analyze_query(second)
+    assert first_analysis.classifications == second_analysis.classifications
+
+    cache = SemanticAnswerCache()
+    cache.store(first, EMBEDDING, "answer", [], first_analysis.cache_guard())
+
+    assert cache.lookup(EMBEDDING, first_analysis.cache_guard()) is not None
+    assert cache.lookup(EMBEDDING, second_analysis.cache_guard()) is None
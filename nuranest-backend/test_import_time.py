@@ -0,0 +1,16 @@
+"""
+Checks that importing the API entry point doesn't load the model/index stack
+"""
+
+from benchmarks.bench_import_time import heavy_imports, measure_import
+
+
+def test_app_main_skips_heavy_imports():
+    _, imported = measure_import("app.main")
+    assert "app.main" in imported
+    assert heavy_imports(imported) == []
+
+
+def test_vercel_entry_point_skips_heavy_imports():
+    _, imported = measure_import("api.index")
+    assert heavy_imports(imported) == []
@@ -0,0 +1,23 @@
+"""
+Checks that a crashed ingestion worker only loses its own file
+"""
+import os
+
+import ingest_local
+from ingest_local import LoadedPDF, iter_pdfs_parallel
+
+
+def load_or_crash(path):
+    if "crash" in path:
+        os._exit(1)  # Like a segfault or an OOM kill
+    return LoadedPDF(os.path.basename(path), pages=1)
+
+
+def test_crashed_worker_only_fails_its_file(monkeypatch):
+    monkeypatch.setattr(ingest_local, "load_and_split_pdf", load_or_crash)
+    paths = [f"medical_data/{name}.pdf" for name in ("a", "b", "crash", "c", "d", "e", "f")]
+
+    results = list(iter_pdfs_parallel(paths, workers=3, max_pending=3))
+
+    assert [r.filename for r in results] == [os.path.basename(p) for p in paths]
+    assert [r.filename for r in results if r.error] == ["crash.pdf"]
@@ -0,0 +1,105 @@
+"""
+Checks that the rule-engine analyzers run exactly once per /ai/ask request
+"""
+
+import asyncio
+import sys
+from collections import Counter
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import app.query_analysis as query_analysis
+from app.agents import PregnancyHealthAgent
+from app.services import PregnancyAIService
+
+ANALYZERS = [
+    "match_symptoms",
+    "extract_gestational_age",
+    "extract_trimester",
+    "classify_symptom",
+    "infer_symptom_combinations",
+    "rank_partial_combinations",
+    "check_symptoms_for_age",
+]
+
+
+def build_service() -> PregnancyAIService:
+    agent = PregnancyHealthAgent(pipeline_mode="direct")
+    agent.answer_cache = None
+    agent.embeddings = DeterministicFakeEmbedding(size=64)
+    agent.vectorstore = FAISS.from_texts(
+        ["Headaches and swelling in pregnancy can be a sign of preeclampsia."],
+        agent.embeddings,
+        metadatas=[{"source": "medical_data/preeclampsia.pdf"}],
+    )
+    agent.llm = FakeListChatModel(responses=["Please contact your OB-GYN today."])
+    agent._build_pipeline()
+
+    service = PregnancyAIService()
+    service.agent = agent
+    service.is_initialized = True
+    return service
+
+
+def count_calls(monkeypatch, names) -> Counter:
+    """
+    Count calls to ``names`` through every app module that holds a reference to them.
+
+    Patching only app.query_analysis would miss a layer (agents, services,
+    topic filter) that imports an analyzer, or analyze_query itself, and
+    re-runs it.
+    """
+    calls = Counter()
+    originals = {name: getattr(query_analysis, name) for name in names}
+
+    def counting(name, func):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    wrappers = {name: counting(name, func) for name, func in originals.items()}
+    for module_name, module in list(sys.modules.items()):
+        if not module_name.startswith("app.") or module is None:
+            continue
+        for attr, value in list(vars(module).items()):
+            for name, func in originals.items():
+                if value is func:
+                    monkeypatch.setattr(module, attr, wrappers[name])
+    return calls
+
+
+def test_analyzers_run_once_per_request(monkeypatch):
+    calls = count_calls(monkeypatch, ["analyze_query"] + ANALYZERS)
+
+    service = build_service()
+    try:
+        response = asyncio.run(service.ask_question("I'm 20 weeks pregnant with a severe headache and swelling"))
+    finally:
+        service.shutdown()
+
+    assert response.answer == "Please contact your OB-GYN today."
+    assert response.timeline_conditions
+    assert {name: calls[name] for name in ["analyze_query"] + ANALYZERS} == {
+        name: 1 for name in ["analyze_query"] + ANALYZERS
+    }
+
+
+def test_analyzers_run_once_per_streamed_request(monkeypatch):
+    calls = count_calls(monkeypatch, ["analyze_query"] + ANALYZERS)
+
+    async def stream():
+        return [event async for event in service.stream_question("I'm 20 weeks pregnant with a severe headache")]
+
+    service = build_service()
+    try:
+        events = asyncio.run(stream())
+    finally:
+        service.shutdown()
+
+    assert events
+    assert {name: calls[name] for name in ["analyze_query"] + ANALYZERS} == {
+        name: 1 for name in ["analyze_query"] + ANALYZERS
+    }
@@ -0,0 +1,51 @@
+"""
+Checks rule store reloads and the shipped clinical rule file
+"""
+import json
+import os
+import threading
+import time
+
+import app.rule_store as rule_store_module
+from app.rule_store import DEFAULT_RULES_PATH, RuleStore
+
+
+def write_rules(path, version):
+    with open(DEFAULT_RULES_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["version"] = version
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_changed_rules_compile_in_background(tmp_path, monkeypatch):
+    path = str(tmp_path / "rules.json")
+    write_rules(path, "1")
+    store = RuleStore(path, check_interval=0.01)
+    assert store.current().version == "1"
+
+    compile_rules = rule_store_module.compile_rules
+    release = threading.Event()
+
+    def slow_compile(data, content_hash):
+        release.wait(timeout=5)
+        return compile_rules(data, content_hash)
+
+    monkeypatch.setattr(rule_store_module, "compile_rules", slow_compile)
+    write_rules(path, "2")
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    time.sleep(0.02)
+
+    # The compile is blocked, yet callers get the previous rules straight away
+    start = time.perf_counter()
+    assert store.current().version == "1"
+    assert time.perf_counter() - start < 1
+
+    release.set()
+    store.wait_for_refresh(timeout=5)
+    assert store.current().version == "2"
+
+
+def test_shipped_rules_need_no_normalization(caplog):
+    RuleStore(check_interval=0).reload()
+    assert not [r for r in caplog.records if "normalized" in r.getMessage()]
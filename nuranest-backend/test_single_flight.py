@@ -0,0 +1,45 @@
+"""
+Checks that concurrent identical questions share one agent run
+"""
+
+import asyncio
+import time
+
+from test_query_analysis import build_service
+
+
+def test_concurrent_duplicates_share_one_agent_run():
+    service = build_service()
+    calls = []
+    process_question = service.agent.process_question
+
+    def slow_process_question(question, analysis=None):
+        calls.append(question)
+        time.sleep(0.2)  # Keep the first run in flight while the duplicates arrive
+        return process_question(question, analysis)
+
+    service.agent.process_question = slow_process_question
+    questions = [
+        "I'm 20 weeks pregnant with a severe headache",
+        "i'm 20 weeks pregnant  with a severe HEADACHE",
+        "I'm 20 weeks pregnant with a severe headache",
+        "I'm 30 weeks pregnant with a severe headache",
+    ]
+
+    async def ask_all():
+        return await asyncio.gather(*(service.ask_question(q) for q in questions))
+
+    try:
+        responses = asyncio.run(ask_all())
+    finally:
+        service.shutdown()
+
+    # Three normalized duplicates coalesce; the 30-week question runs separately
+    assert sorted(calls) == sorted([questions[0], questions[3]])
+    assert service.single_flight.stats() == {"inflight_keys": 0, "executions": 2, "coalesced": 2}
+    assert all(r.answer == "Please contact your OB-GYN today." for r in responses)
+
+    # Per-caller fields are built for each request
+    assert len({id(r.timeline_conditions) for r in responses}) == len(responses)
+    assert {t["week"] for t in responses[3].timeline_conditions} == {30}
+    assert all(r.processing_time > 0 for r in responses)
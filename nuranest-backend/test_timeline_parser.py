@@ -0,0 +1,25 @@
+"""
+Checks gestational age parsing on explicit ages and on numbers that only look like one
+"""
+import pytest
+
+from app.timeline_parser import GestationalAge, extract_gestational_age
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I am 6 weeks pregnant", GestationalAge(6)),
+    ("20w3d and bleeding", GestationalAge(20, 3)),
+    ("currently 20 weeks and 3 days", GestationalAge(20, 3)),
+    ("I'm 20+3 weeks with a headache", GestationalAge(20, 3)),
+    ("pregnant at 32+5, feet swelling", GestationalAge(32, 5)),
+    ("I am 6 weeks pregnant and my BP is 140/90, took 1 + 2 pills", GestationalAge(6)),
+    ("I am 6 weeks pregnant, age 30+2", GestationalAge(6)),
+    ("I am 8 weeks pregnant and 5w2d ago", GestationalAge(8)),
+])
+def test_extract_gestational_age(text, expected):
+    assert extract_gestational_age(text) == expected
+
+
+@pytest.mark.parametrize("text", ["bp 12+3", "took 1 + 2 pills", "age 30+2", "my BP is 140/90"])
+def test_bare_plus_notation_is_not_an_age(text):
+    assert extract_gestational_age(text) is None
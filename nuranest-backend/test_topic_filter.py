@@ -0,0 +1,32 @@
+"""
+Checks that only clearly off-topic questions are refused without the LLM
+"""
+import pytest
+
+from app.topic_filter import is_pregnancy_related
+
+
+@pytest.mark.parametrize("question", [
+    "Can I eat sushi?",
+    "Is coffee okay to drink?",
+    "Can I dye my hair?",
+    "Is it safe to fly in an airplane?",
+    "How much weight should I gain?",
+    "Can I take a hot bath?",
+    "Is it okay to sleep on my back?",
+    "What vitamins should I take?",
+    "My mom says I should avoid spicy food, is that true?",
+    "I'm 20 weeks pregnant, can I still play football?",
+])
+def test_on_topic_or_unsure_questions_reach_the_llm(question):
+    assert is_pregnancy_related(question)
+
+
+@pytest.mark.parametrize("question", [
+    "Write a Python function to sort a list",
+    "What is the capital of France?",
+    "Should I buy bitcoin this moment?",
+    "Who won the world cup in 2018?",
+])
+def test_clearly_off_topic_questions_are_refused(question):
+    assert not is_pregnancy_related(question)